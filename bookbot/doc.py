@@ -1,15 +1,208 @@
 import os
 import json
 import re
+import heapq
+import itertools
+import math
 import shutil
+import sys
 import datetime
 import logging
 import tempfile
-from typing import Dict, List, Any, Optional, Set, Tuple, Union
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import BinaryIO, Callable, Dict, FrozenSet, List, Any, Optional, Set, Tuple, Union
+
+# orjson parses and serializes the companion JSON files much faster when installed
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Characters allowed in document names and property keys, and in tags
+_NAME_CHARS_RE = re.compile(r'[\w\-\.]+')
+
+# A valid document name in one match, so the common case skips the individual checks
+_VALID_NAME_RE = re.compile(r'(?!\.)[\w\-\.]+(?<!\.)')
+_TAG_NAME_RE = re.compile(r'\w+')
+
+# Inline tags (#tag) that are not at the start of a line
+_TAG_RE = re.compile(r'(?<!^)#(\w+)', re.MULTILINE)
+
+# Markdown sections (## Header #tag1 #tag2) and their content, and any #tag in them
+_SECTION_RE = re.compile(r'(#+\s+.*?(?:\s+#\w+)*?)(?=\n#+\s+|\n*$)(.*?)(?=\n#+\s+|\n*$)', re.DOTALL)
+_SECTION_TAG_RE = re.compile(r'#(\w+)')
+
+# Typed property values: boolean, integer or float, each in its own group. Digits
+# may be grouped with single underscores, as int() and float() accept.
+_DIGITS = r'\d+(?:_\d+)*'
+_VALUE_RE = re.compile(r'(?i:(true)|false)'
+                       rf'|([-+]?{_DIGITS})'
+                       rf'|([-+]?(?:{_DIGITS}\.(?:{_DIGITS})?|\.{_DIGITS})(?:[eE][-+]?{_DIGITS})?)')
+# Characters a typed value can start with, besides non-ASCII decimal digits
+_VALUE_FIRST_CHARS = frozenset('tTfF+-.0123456789')
+
+# Number of characters of document text encoded per write when saving
+_WRITE_CHUNK_CHARS = 64 * 1024
+
+# Reading just the properties header starts small, as headers rarely exceed a few
+# hundred bytes, and continues in large reads for documents without a header
+_HEADER_FIRST_READ_BYTES = 8 * 1024
+_HEADER_READ_BYTES = 128 * 1024
+
+# Repo-wide scans read documents on a thread pool once there are enough of them
+# for the overlapping file I/O to outweigh the cost of starting the threads
+_PARALLEL_SCAN_MIN_DOCS = 8
+_SCAN_MAX_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+
+# Cached directory listings are only trusted when the directory's mtime was at least
+# this much older than the scan, as filesystem timestamps can be coarse
+_MTIME_RACE_WINDOW_NS = 1_000_000_000
+
+# Exact types orjson serializes just as the json module does, as values and as
+# dict keys; floats are also handled alike, but only when finite
+_ORJSON_SCALAR_TYPES = frozenset((str, int, bool, type(None)))
+# orjson's nesting limit; deeper or circular data is left to the json module
+_ORJSON_MAX_DEPTH = 255
+
+
+def _orjson_compatible(data: Any) -> bool:
+    """
+    Check whether orjson serializes data to the same JSON values as json.dumps.
+    
+    orjson writes NaN and infinities as null and serializes types the json module
+    rejects, such as datetimes, UUIDs, enums and dataclasses. Such data is left to
+    the json module, so what is saved doesn't depend on whether orjson is installed.
+    
+    Args:
+        data (Any): A Python structure to be JSON serialized
+        
+    Returns:
+        bool: True if data only holds plain JSON types and finite floats
+    """
+    pending = [(0, (data,))]
+    while pending:
+        depth, values = pending.pop()
+        if depth > _ORJSON_MAX_DEPTH:
+            return False
+        for value in values:
+            value_type = type(value)
+            if value_type in _ORJSON_SCALAR_TYPES:
+                continue
+            if value_type is float:
+                if not math.isfinite(value):
+                    return False
+            elif value_type is list or value_type is tuple:
+                pending.append((depth + 1, value))
+            elif value_type is dict:
+                for key in value:
+                    if type(key) not in _ORJSON_SCALAR_TYPES and not (type(key) is float and math.isfinite(key)):
+                        return False
+                pending.append((depth + 1, value.values()))
+            else:
+                return False
+    return True
+
+
+def _json_dumps(data: Any) -> bytes:
+    """
+    Serialize data to indented JSON, using orjson when available.
+    
+    The same data is accepted and written as with the json module, and data that
+    module rejects is rejected with the same error.
+    
+    Args:
+        data (Any): A JSON serializable Python structure
+        
+    Returns:
+        bytes: UTF-8 encoded JSON
+    """
+    if orjson is not None and _orjson_compatible(data):
+        try:
+            return orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+        except TypeError:
+            # Values orjson can't handle, such as integers beyond 64 bits
+            pass
+    return json.dumps(data, indent=2).encode('utf-8')
+
+
+def _json_loads(data: bytes) -> Any:
+    """
+    Parse JSON, using orjson when available.
+    
+    Args:
+        data (bytes): UTF-8 encoded JSON
+        
+    Returns:
+        Any: The parsed Python structure
+    
+    Raises:
+        json.JSONDecodeError: If the data is not valid JSON
+    """
+    if orjson is not None:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            # Retry with the stdlib parser, which also accepts e.g. integers beyond 64 bits
+            pass
+    return json.loads(data)
+
+
+def _read_file(path: str) -> bytes:
+    """
+    Read a whole file with plain os.open/os.read calls.
+    
+    Unlike open(), this needs no buffered or text-mode file object, which saves
+    several syscalls per read of a small file.
+    
+    Args:
+        path (str): Path of the file
+        
+    Returns:
+        bytes: The file contents
+    
+    Raises:
+        OSError: If the file can't be read
+    """
+    fd = os.open(path, os.O_RDONLY | getattr(os, 'O_CLOEXEC', 0) | getattr(os, 'O_BINARY', 0))
+    try:
+        # Ask for one byte more than the current size, so a file read in one go
+        # is recognized without an extra read at end of file
+        size = os.fstat(fd).st_size + 1
+        chunks = []
+        while True:
+            chunk = os.read(fd, size)
+            if not chunk:
+                break
+            chunks.append(chunk)
+            if len(chunk) < size:
+                break
+        return b''.join(chunks)
+    finally:
+        os.close(fd)
+
+
+def _fsync_directory(path: str) -> None:
+    """
+    Flush a directory entry to disk so a preceding rename survives a crash.
+    
+    Args:
+        path (str): Directory to flush
+    """
+    if not hasattr(os, "O_DIRECTORY"):
+        # Directories can't be opened for fsync on this platform (e.g. Windows)
+        return
+    dir_fd = os.open(path, os.O_RDONLY | os.O_DIRECTORY)
+    try:
+        os.fsync(dir_fd)
+    finally:
+        os.close(dir_fd)
 
 
 class Doc:
-    def __init__(self, name: str, repo_path: str, logger: Optional[logging.Logger] = None):
+    def __init__(self, name: str, repo_path: str, logger: Optional[logging.Logger] = None,
+                 sync_dir: bool = True):
         """
         Initialize a Doc object.
         
@@ -17,6 +210,8 @@ class Doc:
             name (str): Name of the document without extension (e.g., 'chapter1')
             repo_path (str): Path to the repository directory
             logger (Optional[logging.Logger]): Logger instance for logging operations
+            sync_dir (bool): Fsync the repository directory when creating a new document;
+                callers creating several documents may pass False and sync it once
         
         Raises:
             ValueError: If the document name contains invalid characters
@@ -31,6 +226,11 @@ class Doc:
         self.history_dir = os.path.join(self.repo_path, "history")
         self.logger = logger or logging.getLogger(__name__)
         
+        # Parsed (properties, text) of the markdown file, keyed by its stat signature
+        self._parsed_cache: Optional[Tuple[Tuple[int, int, int], Dict[str, Any], str]] = None
+        # (text, sections with their tags) of the last section parse
+        self._sections_cache: Optional[Tuple[str, List[Tuple[str, FrozenSet[str]]]]] = None
+        
         # Create history directory if it doesn't exist
         try:
             os.makedirs(self.history_dir, exist_ok=True)
@@ -39,32 +239,36 @@ class Doc:
             self.logger.error(f"Failed to create history directory: {e}")
             raise RuntimeError(f"Failed to create history directory: {e}") from e
         
-        # Initialize files if they don't exist
-        if not os.path.exists(self.md_file):
+        # Initialize files if they don't exist. The exclusive creates tell us whether
+        # a file was already there, so no separate existence checks are needed.
+        timestamp = datetime.datetime.now().isoformat()
+        default_properties = {
+            "filename": f"{name}.md",
+            "version": 1,
+            "creation_time": timestamp,
+            "complete": False  # Initial state is incomplete
+        }
+        try:
             # Create a new document with default properties
-            self.logger.debug(f"Creating new document {self.md_file}")
-            timestamp = datetime.datetime.now().isoformat()
-            default_properties = {
-                "filename": f"{name}.md",
-                "version": 1,
-                "creation_time": timestamp,
-                "complete": False  # Initial state is incomplete
-            }
-            try:
-                self._save_properties_and_text(default_properties, "")
-            except Exception as e:
-                self.logger.error(f"Failed to initialize document {name}: {e}")
-                raise RuntimeError(f"Failed to initialize document {name}: {e}") from e
+            self._save_properties_and_text(default_properties, "", create=True, sync_dir=sync_dir)
+            self.logger.debug(f"Created new document {self.md_file}")
+        except FileExistsError:
+            pass
+        except Exception as e:
+            self.logger.error(f"Failed to initialize document {name}: {e}")
+            raise RuntimeError(f"Failed to initialize document {name}: {e}") from e
         
-        if not os.path.exists(self.json_file):
+        try:
             # Create empty JSON file
-            self.logger.debug(f"Creating new JSON file {self.json_file}")
-            try:
-                with open(self.json_file, 'w') as f:
-                    json.dump({}, f, indent=2)
-            except Exception as e:
-                self.logger.error(f"Failed to initialize JSON file for {name}: {e}")
-                raise RuntimeError(f"Failed to initialize JSON file for {name}: {e}") from e
+            fd = os.open(self.json_file, os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, 'O_CLOEXEC', 0), 0o666)
+            with os.fdopen(fd, 'wb') as f:
+                f.write(_json_dumps({}))
+            self.logger.debug(f"Created new JSON file {self.json_file}")
+        except FileExistsError:
+            pass
+        except Exception as e:
+            self.logger.error(f"Failed to initialize JSON file for {name}: {e}")
+            raise RuntimeError(f"Failed to initialize JSON file for {name}: {e}") from e
     
     @staticmethod
     def _validate_name(name: str) -> None:
@@ -77,13 +281,16 @@ class Doc:
         Raises:
             ValueError: If the document name contains invalid characters
         """
-        print("validate name", name)
+        if _VALID_NAME_RE.fullmatch(name):
+            return
+        
+        # Find out what is wrong with the name, to report it
         # Check for path traversal attempts
         if os.path.sep in name or (os.path.altsep and os.path.altsep in name):
             raise ValueError(f"Invalid document name: {name} (contains path separators)")
         
         # Check for valid filename characters (allow letters, numbers, underscore, hyphen, period)
-        if not re.match(r'^[\w\-\.]+$', name):
+        if not _NAME_CHARS_RE.fullmatch(name):
             raise ValueError(f"Invalid document name: {name} (contains invalid characters)")
         
         # Check if name starts with a dot (hidden file)
@@ -104,7 +311,7 @@ class Doc:
         Raises:
             ValueError: If the property key contains invalid characters
         """
-        if not re.match(r'^[\w\-\.]+$', key):
+        if not _NAME_CHARS_RE.fullmatch(key):
             raise ValueError(f"Invalid property key: {key} (contains invalid characters)")
     
     @staticmethod
@@ -119,7 +326,7 @@ class Doc:
             ValueError: If the tag contains invalid characters
         """
         tag = tag.lstrip('#')
-        if not re.match(r'^\w+$', tag):
+        if not _TAG_NAME_RE.fullmatch(tag):
             raise ValueError(f"Invalid tag: {tag} (must contain only alphanumeric characters and underscore)")
     
     def get_text(self) -> str:
@@ -213,20 +420,79 @@ class Doc:
         
         try:
             properties, text = self._load_properties_and_text()
-            
-            # Handle special case for total_* properties
-            if key.startswith("total_") and key in properties and isinstance(value, (int, float)) and isinstance(properties[key], (int, float)):
-                properties[key] += value
-                self.logger.debug(f"Incremented property {key} by {value} for {self.name}")
-            else:
-                properties[key] = value
-                self.logger.debug(f"Set property {key}={value} for {self.name}")
-            
-            self._save_properties_and_text(properties, text)
+            # Setting a property to its current value, or adding 0 to a total,
+            # doesn't need the document rewritten
+            if self._apply_property(properties, key, value):
+                self._save_properties_and_text(properties, text)
         except Exception as e:
             self.logger.error(f"Error setting property {key} for {self.name}: {e}")
             raise RuntimeError(f"Error setting property {key} for {self.name}: {e}") from e
     
+    def set_properties(self, new_properties: Dict[str, Any]) -> None:
+        """
+        Set several property values with a single write of the document.
+        
+        Each property is handled as by set_property, so total_* properties are
+        incremented rather than replaced.
+        
+        Args:
+            new_properties (Dict[str, Any]): Property keys and values to set
+        
+        Raises:
+            ValueError: If any of the property keys are invalid
+            RuntimeError: If there's an error saving the properties
+        """
+        for key in new_properties:
+            self._validate_property_key(key)
+        
+        try:
+            self._set_properties(new_properties)
+        except Exception as e:
+            self.logger.error(f"Error setting properties for {self.name}: {e}")
+            raise RuntimeError(f"Error setting properties for {self.name}: {e}") from e
+    
+    def _set_properties(self, new_properties: Dict[str, Any], sync_dir: bool = True) -> None:
+        """
+        Set several (validated) property values with a single write of the document.
+        
+        Args:
+            new_properties (Dict[str, Any]): Property keys and values to set
+            sync_dir (bool): Fsync the repository directory after the write
+        """
+        properties, text = self._load_properties_and_text()
+        changed = False
+        for key, value in new_properties.items():
+            changed |= self._apply_property(properties, key, value)
+        if changed:
+            self._save_properties_and_text(properties, text, sync_dir=sync_dir)
+    
+    def _apply_property(self, properties: Dict[str, Any], key: str, value: Any) -> bool:
+        """
+        Set a property in a loaded properties dict.
+        
+        Args:
+            properties (Dict[str, Any]): Properties to update in place
+            key (str): The (validated) property key
+            value (Any): The property value
+            
+        Returns:
+            bool: Whether the stored value changed
+        """
+        key = sys.intern(key)
+        old_value = properties.get(key)
+        
+        # Handle special case for total_* properties
+        if key.startswith("total_") and key in properties and isinstance(value, (int, float)) and isinstance(old_value, (int, float)):
+            properties[key] += value
+            self.logger.debug(f"Incremented property {key} by {value} for {self.name}")
+        else:
+            properties[key] = value
+            self.logger.debug(f"Set property {key}={value} for {self.name}")
+        
+        # Compare types too, as e.g. 1 == 1.0 == True but each is saved differently
+        new_value = properties[key]
+        return old_value is None or type(new_value) is not type(old_value) or new_value != old_value
+    
     def update_text(self, new_text: str, incr_version: bool = True) -> None:
         """
         Update the text content, creating a new version.
@@ -238,23 +504,70 @@ class Doc:
             RuntimeError: If there's an error updating the text
         """
         try:
-            properties, _ = self._load_properties_and_text()
-            
-            # Archive the current version
-            current_version = properties.get("version", 0)
-            self._archive_current_version(current_version)
-            
-            # Update version number
-            if incr_version:
-                properties["version"] = current_version + 1
-            
-            # Save new version
-            self._save_properties_and_text(properties, new_text)
-            self.logger.debug(f"Updated text for {self.name}, new version: {current_version + 1}")
+            self._update_text(new_text, incr_version=incr_version)
+            # Make the archive links and the rename of the new content durable
+            _fsync_directory(self.history_dir)
+            _fsync_directory(self.repo_path)
         except Exception as e:
             self.logger.error(f"Error updating text for {self.name}: {e}")
             raise RuntimeError(f"Error updating text for {self.name}: {e}") from e
     
+    def update_text_batch(self, updates: List[Tuple[str, Optional[Dict[str, Any]]]]) -> None:
+        """
+        Apply several text updates in order, each creating a new version.
+        
+        Equivalent to calling set_property for each property and then update_text
+        for every (text, properties) pair, but the directories are only fsynced
+        once, after the last update.
+        
+        Args:
+            updates (List[Tuple[str, Optional[Dict[str, Any]]]]): (new text, properties
+                to set or None) pairs
+        
+        Raises:
+            ValueError: If any of the property keys are invalid
+            RuntimeError: If there's an error updating the text
+        """
+        for _, properties in updates:
+            for key in properties or {}:
+                self._validate_property_key(key)
+        
+        try:
+            for new_text, properties in updates:
+                self._update_text(new_text, properties)
+            _fsync_directory(self.history_dir)
+            _fsync_directory(self.repo_path)
+        except Exception as e:
+            self.logger.error(f"Error updating text for {self.name}: {e}")
+            raise RuntimeError(f"Error updating text for {self.name}: {e}") from e
+    
+    def _update_text(self, new_text: str, new_properties: Optional[Dict[str, Any]] = None,
+                     incr_version: bool = True) -> None:
+        """
+        Archive the current version and save new text, without syncing the directories.
+        
+        Args:
+            new_text (str): New text content for the document
+            new_properties (Optional[Dict[str, Any]]): Properties to set along with the text
+            incr_version (bool): Whether to bump the version number
+        """
+        properties, _ = self._load_properties_and_text()
+        
+        # Archive the current version
+        current_version = properties.get("version", 0)
+        self._archive_current_version(current_version)
+        
+        for key, value in (new_properties or {}).items():
+            self._apply_property(properties, key, value)
+        
+        # Update version number
+        if incr_version:
+            properties["version"] = current_version + 1
+        
+        # Save new version
+        self._save_properties_and_text(properties, new_text, sync_dir=False)
+        self.logger.debug(f"Updated text for {self.name}, new version: {current_version + 1}")
+    
     def append_text(self, text_to_append: str) -> None:
         """
         Append text to the document and save it.
@@ -292,31 +605,8 @@ class Doc:
             self._validate_tag(tag)
         
         try:
-            _, text = self._load_properties_and_text()
-            
             # Normalize tags to make comparison case-insensitive
-            normalize = lambda tag: tag.lower().strip('#')
-            normalized_tags = [normalize(tag) for tag in tags]
-            
-            # Extract sections using regular expressions
-            # Looking for Markdown headers followed by content
-            sections = []
-            
-            # Match headers (## Header #tag1 #tag2) and their content
-            pattern = r'(#+\s+.*?(?:\s+#\w+)*?)(?=\n#+\s+|\n*$)(.*?)(?=\n#+\s+|\n*$)'
-            matches = re.finditer(pattern, text, re.DOTALL)
-            
-            for match in matches:
-                header = match.group(1).strip()
-                content = match.group(2).strip()
-                
-                # Extract tags from the header
-                header_tags = re.findall(r'#(\w+)', header)
-                normalized_header_tags = [normalize(tag) for tag in header_tags]
-                
-                # Check if all requested tags are in the section
-                if all(tag in normalized_header_tags for tag in normalized_tags):
-                    sections.append(f"{header}\n{content}")
+            sections = self._matching_sections(frozenset(tag.lower().strip('#') for tag in tags))
             
             self.logger.debug(f"Found {len(sections)} sections with tags {tags} in {self.name}")
             return sections
@@ -324,6 +614,54 @@ class Doc:
             self.logger.error(f"Error getting sections with tags {tags} in {self.name}: {e}")
             raise RuntimeError(f"Error getting sections with tags {tags} in {self.name}: {e}") from e
     
+    def _matching_sections(self, normalized_tags: FrozenSet[str]) -> List[str]:
+        """
+        Get sections that contain all of the given, already normalized, tags.
+        
+        Args:
+            normalized_tags (FrozenSet[str]): Validated, lowercased tags
+            
+        Returns:
+            List[str]: List of section texts that match the tags
+        """
+        # Check if all requested tags are in the section
+        return [section for section, header_tags in self._sections()
+                if header_tags.issuperset(normalized_tags)]
+    
+    def _sections(self) -> List[Tuple[str, FrozenSet[str]]]:
+        """
+        Split the document into sections along with the (lowercased) tags of each.
+        
+        The result is reused until the text changes, so repeated tag queries
+        against an unchanged document don't run the section pattern again.
+        
+        Returns:
+            List[Tuple[str, FrozenSet[str]]]: (section text, tags) for each section
+        """
+        _, text = self._load_properties_and_text()
+        
+        # The parsed-content cache hands out the same text object until the file
+        # changes, so an identity check is enough to tell the text is unchanged
+        cached = self._sections_cache
+        if cached is not None and cached[0] is text:
+            return cached[1]
+        
+        # Extract sections using regular expressions
+        # Looking for Markdown headers followed by content
+        sections = []
+        # Every section starts with a '#' header, so text without one has none
+        matches = _SECTION_RE.finditer(text) if '#' in text else ()
+        for match in matches:
+            header = match.group(1).strip()
+            content = match.group(2).strip()
+            
+            # Extract tags from the header
+            header_tags = frozenset(tag.lower() for tag in _SECTION_TAG_RE.findall(header))
+            sections.append((f"{header}\n{content}", header_tags))
+        
+        self._sections_cache = (text, sections)
+        return sections
+    
     def add_tag_to_section(self, section_header: str, tag: str) -> bool:
         """
         Add a tag to a specific section.
@@ -390,16 +728,15 @@ class Doc:
         try:
             versions = []
             # Check current version
-            properties, _ = self._load_properties_and_text()
-            current_version = properties.get("version", 1)
-            versions.append(current_version)
+            versions.append(self._current_version())
             
-            # Check archived versions
-            pattern = f"{self.name}_v(\\d+)\\.md"
+            # Check archived versions, named {name}_v{version}.md
+            prefix = f"{self.name}_v"
             for filename in os.listdir(self.history_dir):
-                match = re.match(pattern, filename)
-                if match:
-                    versions.append(int(match.group(1)))
+                if filename.startswith(prefix) and filename.endswith(".md"):
+                    number = filename[len(prefix):-3]
+                    if number.isdecimal():
+                        versions.append(int(number))
             
             self.logger.debug(f"Retrieved {len(versions)} versions for {self.name}: {versions}")
             return sorted(versions)
@@ -407,12 +744,15 @@ class Doc:
             self.logger.error(f"Error retrieving versions for {self.name}: {e}")
             raise RuntimeError(f"Error retrieving versions for {self.name}: {e}") from e
     
-    def get_version_text(self, version: int) -> str:
+    def get_version_text(self, version: int,
+                         current_props: Optional[Dict[str, Any]] = None) -> str:
         """
         Get text content of a specific version.
         
         Args:
             version (int): Version number
+            current_props (Optional[Dict[str, Any]]): Already-parsed properties of the
+                current version, used to avoid re-reading the current document
         
         Returns:
             str: Text content of the specified version
@@ -422,21 +762,7 @@ class Doc:
             RuntimeError: If there's an error reading the version
         """
         try:
-            properties, _ = self._load_properties_and_text()
-            current_version = properties.get("version", 1)
-            
-            if version == current_version:
-                return self.get_text()
-            
-            # Look in history directory
-            version_md_file = os.path.join(self.history_dir, f"{self.name}_v{version}.md")
-            
-            if not os.path.exists(version_md_file):
-                error_msg = f"Version {version} not found for {self.name}"
-                self.logger.error(error_msg)
-                raise ValueError(error_msg)
-            
-            _, text = self._load_properties_and_text_from_file(version_md_file)
+            _, text = self._load_version(version, current_props)
             self.logger.debug(f"Retrieved text for version {version} of {self.name}")
             return text
         except ValueError:
@@ -445,12 +771,15 @@ class Doc:
             self.logger.error(f"Error retrieving text for version {version} of {self.name}: {e}")
             raise RuntimeError(f"Error retrieving text for version {version} of {self.name}: {e}") from e
     
-    def get_version_properties(self, version: int) -> Dict[str, Any]:
+    def get_version_properties(self, version: int,
+                               current_props: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """
         Get properties of a specific version.
         
         Args:
             version (int): Version number
+            current_props (Optional[Dict[str, Any]]): Already-parsed properties of the
+                current version, used to avoid re-reading the current document
         
         Returns:
             Dict[str, Any]: Properties of the specified version
@@ -460,21 +789,7 @@ class Doc:
             RuntimeError: If there's an error reading the version properties
         """
         try:
-            properties, _ = self._load_properties_and_text()
-            current_version = properties.get("version", 1)
-            
-            if version == current_version:
-                return properties
-            
-            # Look in history directory
-            version_md_file = os.path.join(self.history_dir, f"{self.name}_v{version}.md")
-            
-            if not os.path.exists(version_md_file):
-                error_msg = f"Version {version} not found for {self.name}"
-                self.logger.error(error_msg)
-                raise ValueError(error_msg)
-            
-            props, _ = self._load_properties_and_text_from_file(version_md_file)
+            props, _ = self._load_version(version, current_props)
             self.logger.debug(f"Retrieved properties for version {version} of {self.name}")
             return props
         except ValueError:
@@ -483,6 +798,35 @@ class Doc:
             self.logger.error(f"Error retrieving properties for version {version} of {self.name}: {e}")
             raise RuntimeError(f"Error retrieving properties for version {version} of {self.name}: {e}") from e
         
+    def get_version_bundle(self, versions: List[int]) -> Dict[int, Tuple[Dict[str, Any], str]]:
+        """
+        Get properties and text of several versions at once.
+        
+        The current document is read once for the whole batch and each archived
+        version file is read once, rather than once per property or text lookup.
+        
+        Args:
+            versions (List[int]): Version numbers
+        
+        Returns:
+            Dict[int, Tuple[Dict[str, Any], str]]: Properties and text content by version
+        
+        Raises:
+            ValueError: If a version is not found
+            RuntimeError: If there's an error reading the versions
+        """
+        try:
+            current_props, current_text = self._load_properties_and_text()
+            bundle = {version: self._load_version(version, current_props, current_text)
+                      for version in versions}
+            self.logger.debug(f"Retrieved {len(bundle)} versions of {self.name}")
+            return bundle
+        except ValueError:
+            raise
+        except Exception as e:
+            self.logger.error(f"Error retrieving versions {versions} of {self.name}: {e}")
+            raise RuntimeError(f"Error retrieving versions {versions} of {self.name}: {e}") from e
+        
     def revert_to_version(self, version: int) -> None:
         """
         Revert to a previous version, creating a new version with the same content and properties.
@@ -495,18 +839,14 @@ class Doc:
             RuntimeError: If there's an error reverting to the version
         """
         try:
-            if version not in self.get_versions():
-                error_msg = f"Version {version} not found for {self.name}"
-                self.logger.error(error_msg)
-                raise ValueError(error_msg)
+            # Load the current document once and reuse it for every lookup below
+            current_properties, current_text = self._load_properties_and_text()
+            current_version = current_properties.get("version", 1)
             
             # Get the properties and text of the version to revert to
-            old_props = self.get_version_properties(version)
-            old_text = self.get_version_text(version)
+            old_props, old_text = self._load_version(version, current_properties, current_text)
             
             # Archive current version
-            current_properties, _ = self._load_properties_and_text()
-            current_version = current_properties.get("version", 1)
             self._archive_current_version(current_version)
             
             # Increment version number for the new revision
@@ -558,8 +898,7 @@ class Doc:
                 return False
             
             # Get current version number
-            properties, _ = self._load_properties_and_text()
-            current_version = properties.get("version", 1)
+            current_version = self._current_version()
             
             # If this is the first version, nothing to roll back to
             if current_version <= 1:
@@ -578,9 +917,12 @@ class Doc:
                 self.logger.error(f"Cannot rollback {self.name}: history files for version {previous_version} not found")
                 return False
             
-            # Copy history files to current files (without creating a new version)
-            shutil.copy2(version_md_file, self.md_file)
-            shutil.copy2(version_json_file, self.json_file)
+            # Copy history files to current files (without creating a new version).
+            # Each copy is swapped in under a new inode, so cached reads keyed on the
+            # file signature see the change even though copy2 restores the old mtime.
+            self._replace_with_copy(version_md_file, self.md_file)
+            self._replace_with_copy(version_json_file, self.json_file)
+            self._parsed_cache = None
             
             self.logger.debug(f"Rolled back document {self.name} from version {current_version} to {previous_version}")
             return True
@@ -588,6 +930,38 @@ class Doc:
             self.logger.error(f"Error rolling back document {self.name}: {e}")
             raise RuntimeError(f"Error rolling back document {self.name}: {e}") from e
     
+    def _replace_with_copy(self, src: str, dst: str) -> None:
+        """
+        Atomically replace a file with a copy of another one.
+        
+        Args:
+            src (str): Path of the file to copy
+            dst (str): Path of the file to replace
+        """
+        temp_fd, temp_path = tempfile.mkstemp(dir=self.repo_path)
+        os.close(temp_fd)
+        moved = False
+        try:
+            shutil.copy2(src, temp_path)
+            os.replace(temp_path, dst)
+            moved = True
+        finally:
+            if not moved:
+                self._discard_temp_file(temp_path)
+    
+    @staticmethod
+    def _discard_temp_file(temp_path: str) -> None:
+        """
+        Remove a temporary file left behind by a failed write, if it still exists.
+        
+        Args:
+            temp_path (str): Path of the temporary file
+        """
+        try:
+            os.unlink(temp_path)
+        except FileNotFoundError:
+            pass
+    
     def get_json_data(self) -> Dict[str, Any]:
         """
         Get the contents of the companion JSON file as a Python object.
@@ -599,8 +973,7 @@ class Doc:
             RuntimeError: If there's an error reading the JSON file
         """
         try:
-            with open(self.json_file, 'r') as f:
-                data = json.load(f)
+            data = _json_loads(_read_file(self.json_file))
             self.logger.debug(f"Retrieved JSON data for {self.name}")
             return data
         except json.JSONDecodeError as e:
@@ -624,18 +997,35 @@ class Doc:
             RuntimeError: If there's an error saving the JSON data
         """
         try:
+            content = _json_dumps(data)
+            
+            # Comparing the serialized bytes is much cheaper than an atomic rewrite,
+            # and unlike comparing parsed data it can't mistake e.g. 1 for true
+            try:
+                if _read_file(self.json_file) == content:
+                    self.logger.debug(f"JSON data for {self.name} is unchanged")
+                    return
+            except FileNotFoundError:
+                pass
+            
             # Create a temporary file for atomic write
             temp_fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(self.json_file))
+            moved = False
             try:
-                with os.fdopen(temp_fd, 'w') as f:
-                    json.dump(data, f, indent=2)
+                with os.fdopen(temp_fd, 'wb') as f:
+                    f.write(content)
+                    # Make the data durable before the rename can expose it
+                    f.flush()
+                    os.fsync(f.fileno())
                 # Atomic replace
                 os.replace(temp_path, self.json_file)
-                self.logger.debug(f"Saved JSON data for {self.name}")
-            except Exception as e:
-                # Clean up the temp file if an error occurs
-                os.unlink(temp_path)
-                raise e
+                moved = True
+            finally:
+                # Clean up the temp file if it never made it into place
+                if not moved:
+                    self._discard_temp_file(temp_path)
+            _fsync_directory(self.repo_path)
+            self.logger.debug(f"Saved JSON data for {self.name}")
         except Exception as e:
             self.logger.error(f"Error saving JSON data for {self.name}: {e}")
             raise RuntimeError(f"Error saving JSON data for {self.name}: {e}") from e
@@ -651,28 +1041,136 @@ class Doc:
             RuntimeError: If there's an error archiving the current version
         """
         try:
-            # Copy current files to history directory
+            # Link current files into the history directory. The current files are
+            # only ever replaced by rename, never rewritten in place, so sharing the
+            # inode with the archived copy is safe and avoids copying the content.
             version_md_file = os.path.join(self.history_dir, f"{self.name}_v{version}.md")
             version_json_file = os.path.join(self.history_dir, f"{self.name}_v{version}.json")
             
-            shutil.copy2(self.md_file, version_md_file)
-            shutil.copy2(self.json_file, version_json_file)
+            self._link_or_copy(self.md_file, version_md_file)
+            self._link_or_copy(self.json_file, version_json_file)
             self.logger.debug(f"Archived version {version} of {self.name}")
         except Exception as e:
             self.logger.error(f"Error archiving version {version} of {self.name}: {e}")
             raise RuntimeError(f"Error archiving version {version} of {self.name}: {e}") from e
     
+    @staticmethod
+    def _link_or_copy(src: str, dst: str) -> None:
+        """
+        Hard link a file to a new path, replacing any existing file there.
+        
+        Falls back to copying on filesystems without hard link support.
+        
+        Args:
+            src (str): Path of the existing file
+            dst (str): Path of the link to create
+        """
+        try:
+            os.unlink(dst)
+        except FileNotFoundError:
+            pass
+        try:
+            os.link(src, dst)
+        except OSError:
+            shutil.copy2(src, dst)
+    
+    def _current_version(self) -> int:
+        """
+        Get the version number of the current document.
+        
+        Returns:
+            int: Current version number
+        """
+        return self._load_properties_only().get("version", 1)
+    
+    def _load_version(self, version: int, current_props: Optional[Dict[str, Any]] = None,
+                      current_text: Optional[str] = None) -> Tuple[Dict[str, Any], str]:
+        """
+        Load properties and text of a specific version.
+        
+        The current document is only read when it is not supplied by the caller, and
+        archived versions are read directly from the history directory.
+        
+        Args:
+            version (int): Version number
+            current_props (Optional[Dict[str, Any]]): Already-parsed current properties
+            current_text (Optional[str]): Already-loaded current text
+            
+        Returns:
+            Tuple[Dict[str, Any], str]: Properties and text content of the version
+        
+        Raises:
+            ValueError: If version not found
+        """
+        if current_props is None:
+            current_props, current_text = self._load_properties_and_text()
+        
+        if version == current_props.get("version", 1):
+            if current_text is None:
+                _, current_text = self._load_properties_and_text()
+            return current_props, current_text
+        
+        # Look in history directory
+        version_md_file = os.path.join(self.history_dir, f"{self.name}_v{version}.md")
+        
+        if not os.path.exists(version_md_file):
+            error_msg = f"Version {version} not found for {self.name}"
+            self.logger.error(error_msg)
+            raise ValueError(error_msg)
+        
+        return self._load_properties_and_text_from_file(version_md_file)
+    
     def _load_properties_and_text(self) -> Tuple[Dict[str, Any], str]:
         """
         Load properties and text from the markdown file.
         
+        The parsed result is cached and reused as long as the file's inode, size and
+        modification time are unchanged, so repeated reads don't re-parse the file.
+        
         Returns:
             Tuple[Dict[str, Any], str]: Properties and text content
         
         Raises:
             RuntimeError: If there's an error loading properties and text
         """
-        return self._load_properties_and_text_from_file(self.md_file)
+        try:
+            st = os.stat(self.md_file)
+        except FileNotFoundError:
+            self._parsed_cache = None
+            return self._load_properties_and_text_from_file(self.md_file)
+        
+        signature = (st.st_ino, st.st_size, st.st_mtime_ns)
+        cached = self._parsed_cache
+        if cached is None or cached[0] != signature:
+            properties, text = self._load_properties_and_text_from_file(self.md_file)
+            cached = (signature, properties, text)
+            self._parsed_cache = cached
+        
+        # Hand out a copy so callers can't mutate the cached properties
+        return dict(cached[1]), cached[2]
+    
+    def _load_properties_only(self) -> Dict[str, Any]:
+        """
+        Load only the properties of the markdown file.
+        
+        Uses the parsed-content cache when it is current, otherwise reads just the
+        properties section of the file without loading the text.
+        
+        Returns:
+            Dict[str, Any]: Document properties
+        
+        Raises:
+            RuntimeError: If there's an error loading properties
+        """
+        cached = self._parsed_cache
+        if cached is not None:
+            try:
+                st = os.stat(self.md_file)
+            except FileNotFoundError:
+                st = None
+            if st is not None and cached[0] == (st.st_ino, st.st_size, st.st_mtime_ns):
+                return dict(cached[1])
+        return self._read_properties_from_file(self.md_file, self.logger)
     
     def _load_properties_and_text_from_file(self, file_path: str) -> Tuple[Dict[str, Any], str]:
         """
@@ -688,24 +1186,17 @@ class Doc:
             RuntimeError: If there's an error loading properties and text from the file
         """
         try:
-            with open(file_path, 'r') as f:
-                content = f.read()
+            content = _read_file(file_path).decode('utf-8')
+            # Match the newline translation of text-mode reads
+            if '\r' in content:
+                content = content.replace('\r\n', '\n').replace('\r', '\n')
             
             # Split properties and text
             parts = content.split('---', 1)
             
             if len(parts) == 2:
                 properties_text, text = parts
-                # Parse properties
-                properties = {}
-                for line in properties_text.strip().split('\n'):
-                    if line.strip():
-                        try:
-                            key, value = line.split(':', 1)
-                            properties[key.strip()] = self._parse_property_value(value.strip())
-                        except ValueError:
-                            self.logger.warning(f"Skipping invalid property line: {line}")
-                return properties, text.strip()
+                return self._parse_properties(properties_text, self.logger), text.strip()
             else:
                 # No properties section
                 return {}, content.strip()
@@ -716,7 +1207,81 @@ class Doc:
             self.logger.error(f"Error loading properties and text from {file_path}: {e}")
             raise RuntimeError(f"Error loading properties and text from {file_path}: {e}") from e
     
-    def _parse_property_value(self, value: str) -> Any:
+    @staticmethod
+    def _read_properties_from_file(file_path: str, logger: logging.Logger) -> Dict[str, Any]:
+        """
+        Load only the properties section of a markdown file.
+        
+        The file is read in binary chunks only up to the '---' separator, so the
+        document body is usually never loaded.
+        
+        Args:
+            file_path (str): Path to the markdown file
+            logger (logging.Logger): Logger for reporting invalid property lines
+            
+        Returns:
+            Dict[str, Any]: Properties, or an empty dict if the file has no properties section
+        
+        Raises:
+            RuntimeError: If there's an error loading properties from the file
+        """
+        try:
+            data = bytearray()
+            fd = os.open(file_path, os.O_RDONLY | getattr(os, 'O_CLOEXEC', 0) | getattr(os, 'O_BINARY', 0))
+            try:
+                read_size = _HEADER_FIRST_READ_BYTES
+                while True:
+                    chunk = os.read(fd, read_size)
+                    if not chunk:
+                        # No properties section
+                        return {}
+                    # The separator may straddle the previous chunk
+                    start = max(0, len(data) - 2)
+                    data += chunk
+                    separator = data.find(b'---', start)
+                    if separator != -1:
+                        break
+                    read_size = _HEADER_READ_BYTES
+            finally:
+                os.close(fd)
+            
+            header = data[:separator].decode('utf-8')
+            # Match the newline translation of text-mode reads
+            if '\r' in header:
+                header = header.replace('\r\n', '\n').replace('\r', '\n')
+            return Doc._parse_properties(header, logger)
+        except FileNotFoundError:
+            logger.warning(f"File not found: {file_path}, returning empty properties")
+            return {}
+        except Exception as e:
+            logger.error(f"Error loading properties from {file_path}: {e}")
+            raise RuntimeError(f"Error loading properties from {file_path}: {e}") from e
+    
+    @staticmethod
+    def _parse_properties(properties_text: str, logger: logging.Logger) -> Dict[str, Any]:
+        """
+        Parse the properties section of a markdown file.
+        
+        Args:
+            properties_text (str): Text before the '---' separator
+            logger (logging.Logger): Logger for reporting invalid property lines
+            
+        Returns:
+            Dict[str, Any]: Parsed properties
+        """
+        properties = {}
+        for line in properties_text.strip().split('\n'):
+            if line.strip():
+                try:
+                    key, value = line.split(':', 1)
+                    # Keys repeat across every document, so share one string object per key
+                    properties[sys.intern(key.strip())] = Doc._parse_property_value(value.strip())
+                except ValueError:
+                    logger.warning(f"Skipping invalid property line: {line}")
+        return properties
+    
+    @staticmethod
+    def _parse_property_value(value: str) -> Any:
         """
         Parse property value, attempting to convert to appropriate type.
         
@@ -726,51 +1291,99 @@ class Doc:
         Returns:
             Any: Parsed value (int, float, bool, or str)
         """
-        # Try to convert to numeric or boolean
-        try:
-            if value.lower() == 'true':
-                return True
-            elif value.lower() == 'false':
-                return False
-            elif '.' in value:
-                return float(value)
-            else:
-                return int(value)
-        except (ValueError, AttributeError):
+        # Most plain strings are recognized by their first character alone
+        first = value[:1]
+        if first not in _VALUE_FIRST_CHARS and not first.isdecimal():
             return value
+        
+        # Classify the value with a single regex match, so plain strings don't pay
+        # for several string checks or a failed int()/float() conversion
+        match = _VALUE_RE.fullmatch(value)
+        if match is None:
+            return value
+        true, integer, decimal = match.groups()
+        if integer is not None:
+            return int(integer)
+        if decimal is not None:
+            return float(decimal)
+        return true is not None
     
-    def _save_properties_and_text(self, properties: Dict[str, Any], text: str) -> None:
+    def _save_properties_and_text(self, properties: Dict[str, Any], text: str,
+                                  create: bool = False, sync_dir: bool = True) -> None:
         """
         Save properties and text to the markdown file using safe atomic writes.
         
+        The content is written to a temporary file, fsynced, renamed over the
+        document and the directory is fsynced so the rename itself is durable.
+        When creating a new document there is no previous content to protect, so
+        the file is written in place instead, skipping the temp file and rename.
+        
         Args:
             properties (Dict[str, Any]): Properties to save
             text (str): Text content to save
+            create (bool): Create a new document; fails if the file already exists
+            sync_dir (bool): Fsync the repository directory; callers saving several
+                files may pass False and sync the directory once themselves
         
         Raises:
+            FileExistsError: If creating a document whose file already exists
             RuntimeError: If there's an error saving properties and text
         """
         try:
-            # Format properties section
-            properties_text = '\n'.join([f"{key}: {value}" for key, value in properties.items()])
-            
-            # Combine properties and text
-            content = f"{properties_text}\n---\n{text}"
+            if create:
+                fd = os.open(self.md_file, os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, 'O_CLOEXEC', 0), 0o600)
+                with os.fdopen(fd, 'wb') as f:
+                    self._write_properties_and_text(f, properties, text)
+                self._parsed_cache = None
+                if sync_dir:
+                    _fsync_directory(self.repo_path)
+                return
             
             # Create a temporary file in the same directory
             temp_fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(self.md_file))
+            moved = False
             try:
-                with os.fdopen(temp_fd, 'w') as f:
-                    f.write(content)
+                with os.fdopen(temp_fd, 'wb') as f:
+                    self._write_properties_and_text(f, properties, text)
                 # Atomic replace
                 os.replace(temp_path, self.md_file)
-            except Exception as e:
-                # Clean up the temp file if an error occurs
-                os.unlink(temp_path)
-                raise e
+                moved = True
+                self._parsed_cache = None
+            finally:
+                # Clean up the temp file if it never made it into place
+                if not moved:
+                    self._discard_temp_file(temp_path)
+            if sync_dir:
+                _fsync_directory(self.repo_path)
+        except FileExistsError:
+            raise
         except Exception as e:
             self.logger.error(f"Error saving properties and text for {self.name}: {e}")
             raise RuntimeError(f"Error saving properties and text for {self.name}: {e}") from e
+    
+    @staticmethod
+    def _write_properties_and_text(f: BinaryIO, properties: Dict[str, Any], text: str) -> None:
+        """
+        Write a document to an open binary file and fsync it.
+        
+        The properties section, separator and text are streamed straight to the file
+        instead of building the whole document as one string first, and the text is
+        encoded in bounded chunks so no full-size bytes copy of it is ever held.
+        
+        Args:
+            f (BinaryIO): File opened for binary writing
+            properties (Dict[str, Any]): Properties to write
+            text (str): Text content to write
+        """
+        for key, value in properties.items():
+            f.write(f"{key}: {value}\n".encode('utf-8'))
+        f.write(b"---\n")
+        for start in range(0, len(text), _WRITE_CHUNK_CHARS):
+            f.write(text[start:start + _WRITE_CHUNK_CHARS].encode('utf-8'))
+        # Make the data durable before a rename can expose it, otherwise
+        # a crash can leave an empty file in place of the document
+        f.flush()
+        os.fsync(f.fileno())
 
 
     def get_all_tags(self) -> List[str]:
@@ -787,20 +1400,14 @@ class Doc:
         try:
             text = self.get_text()
             
-            # Find all tags that aren't at the start of a line
-            # This regex matches a # that has a non-whitespace character before it
-            # or is preceded by whitespace but not at the beginning of a line
-            #TODO Use one regex for everything 
-            tags = re.findall(r'(?<=\S)#(\w+)|(?<=\s)#(\w+)', text)
-            
-            # The regex will return tuples of (match1, match2) where one is empty
-            # We need to flatten this list and remove empty strings
-            flat_tags = []
-            for match_pair in tags:
-                flat_tags.extend([tag for tag in match_pair if tag])
+            # Tag-free text needs no regex scan at all
+            if '#' not in text:
+                self.logger.debug(f"Found 0 unique tags in document {self.name}")
+                return []
             
-            # Get unique tags and sort them
-            unique_tags = sorted(set(flat_tags))
+            # Find all tags that aren't at the start of a line and get them
+            # unique and sorted
+            unique_tags = sorted(set(_TAG_RE.findall(text)))
             
             self.logger.debug(f"Found {len(unique_tags)} unique tags in document {self.name}")
             return unique_tags
@@ -824,6 +1431,17 @@ class DocRepo:
         self.repo_path = os.path.abspath(repo_path)
         self.logger = logger or logging.getLogger(__name__)
         
+        # Doc instances handed out by get_doc, so their parsed-content caches are reused.
+        # Repo-wide scans call get_doc from worker threads, hence the lock.
+        self._doc_cache: Dict[str, Doc] = {}
+        self._doc_cache_lock = threading.Lock()
+        # (directory mtime, document names) of the last list_docs scan
+        self._list_docs_cache: Optional[Tuple[int, List[str]]] = None
+        # Inverted index for get_sections_with_tags: tag -> names of the documents
+        # using it, plus each indexed document's file signature and tag set
+        self._tag_index: Dict[str, Set[str]] = {}
+        self._indexed_tags: Dict[str, Tuple[Tuple[int, int, int], Set[str]]] = {}
+        
         try:
             os.makedirs(repo_path, exist_ok=True)
             os.makedirs(os.path.join(repo_path, "history"), exist_ok=True)
@@ -851,6 +1469,9 @@ class DocRepo:
         """
         try:
             doc = Doc(name, self.repo_path, self.logger)
+            with self._doc_cache_lock:
+                self._doc_cache[name] = doc
+            self._list_docs_cache = None
             
             # Ensure the 'complete' property is set
             if initial_properties is None:
@@ -859,8 +1480,7 @@ class DocRepo:
                 initial_properties['complete'] = False
             
             # Set initial properties if provided
-            for key, value in initial_properties.items():
-                doc.set_property(key, value)
+            doc.set_properties(initial_properties)
             
             # Set initial text if provided
             if initial_text:
@@ -875,6 +1495,55 @@ class DocRepo:
             self.logger.error(f"Error creating document {name}: {e}")
             raise RuntimeError(f"Error creating document {name}: {e}") from e
     
+    def create_doc_batch(self, specs: List[Tuple[str, Optional[Dict[str, Any]], str]]) -> List[Doc]:
+        """
+        Create several documents and return their Doc objects.
+        
+        Each (name, initial_properties, initial_text) spec is handled as by
+        create_doc, but the repository and history directories are fsynced once
+        for the whole batch instead of after every file.
+        
+        Args:
+            specs (List[Tuple[str, Optional[Dict[str, Any]], str]]): (name, initial
+                properties or None, initial text) for each document
+            
+        Returns:
+            List[Doc]: The created document objects, in the order of specs
+        
+        Raises:
+            ValueError: If any document name or property key is invalid; no documents
+                are created in that case
+            RuntimeError: If the documents cannot be created
+        """
+        for name, initial_properties, _ in specs:
+            Doc._validate_name(name)
+            for key in initial_properties or {}:
+                Doc._validate_property_key(key)
+        
+        try:
+            docs = []
+            for name, initial_properties, initial_text in specs:
+                doc = Doc(name, self.repo_path, self.logger, sync_dir=False)
+                with self._doc_cache_lock:
+                    self._doc_cache[name] = doc
+                
+                properties = dict(initial_properties or {})
+                properties.setdefault('complete', False)
+                doc._set_properties(properties, sync_dir=False)
+                if initial_text:
+                    doc._update_text(initial_text, incr_version=False)
+                docs.append(doc)
+            
+            self._list_docs_cache = None
+            _fsync_directory(os.path.join(self.repo_path, "history"))
+            _fsync_directory(self.repo_path)
+            
+            self.logger.debug(f"Created {len(docs)} documents")
+            return docs
+        except Exception as e:
+            self.logger.error(f"Error creating documents: {e}")
+            raise RuntimeError(f"Error creating documents: {e}") from e
+    
     def delete_doc(self, name: str) -> bool:
         """
         Delete a document and all its versions.
@@ -894,24 +1563,25 @@ class DocRepo:
         
         md_file = os.path.join(self.repo_path, f"{name}.md")
         json_file = os.path.join(self.repo_path, f"{name}.json")
+        with self._doc_cache_lock:
+            self._doc_cache.pop(name, None)
+        self._list_docs_cache = None
         
         try:
-            # Check if files exist
-            if not (os.path.exists(md_file) or os.path.exists(json_file)):
+            # Delete main files, letting the unlink itself tell us whether they existed
+            found = False
+            for path in (md_file, json_file):
+                try:
+                    os.remove(path)
+                    found = True
+                except FileNotFoundError:
+                    pass
+            
+            if not found:
                 self.logger.debug(f"Document {name} not found for deletion")
                 return False
             
-            # Delete main files
-            if os.path.exists(md_file):
-                os.remove(md_file)
-            if os.path.exists(json_file):
-                os.remove(json_file)
-            
-            # Delete history files
-            history_dir = os.path.join(self.repo_path, "history")
-            for filename in os.listdir(history_dir):
-                if filename.startswith(f"{name}_v") and (filename.endswith(".md") or filename.endswith(".json")):
-                    os.remove(os.path.join(history_dir, filename))
+            self._remove_history_files({name})
             
             self.logger.debug(f"Deleted document {name} and its history")
             return True
@@ -919,6 +1589,89 @@ class DocRepo:
             self.logger.error(f"Error deleting document {name}: {e}")
             raise RuntimeError(f"Error deleting document {name}: {e}") from e
     
+    def delete_doc_batch(self, names: List[str]) -> List[bool]:
+        """
+        Delete several documents and all their versions.
+        
+        Equivalent to calling delete_doc for each name, but the history directory
+        is scanned once for the whole batch.
+        
+        Args:
+            names (List[str]): Document names without extension
+            
+        Returns:
+            List[bool]: For each name, True if the document was deleted, False if not found
+        
+        Raises:
+            ValueError: If any document name is invalid; nothing is deleted in that case
+            RuntimeError: If the documents cannot be deleted
+        """
+        for name in names:
+            Doc._validate_name(name)
+        
+        with self._doc_cache_lock:
+            for name in names:
+                self._doc_cache.pop(name, None)
+        self._list_docs_cache = None
+        
+        try:
+            deleted = []
+            for name in names:
+                found = False
+                for extension in (".md", ".json"):
+                    try:
+                        os.remove(os.path.join(self.repo_path, f"{name}{extension}"))
+                        found = True
+                    except FileNotFoundError:
+                        pass
+                deleted.append(found)
+            
+            self._remove_history_files({name for name, found in zip(names, deleted) if found})
+            
+            self.logger.debug(f"Deleted {sum(deleted)} of {len(names)} documents and their history")
+            return deleted
+        except Exception as e:
+            self.logger.error(f"Error deleting documents {names}: {e}")
+            raise RuntimeError(f"Error deleting documents {names}: {e}") from e
+    
+    def _remove_history_files(self, names: Set[str]) -> None:
+        """
+        Remove all archived versions of documents in a single pass over the history directory.
+        
+        Where the platform supports it, files are unlinked relative to an open descriptor
+        of the history directory, so the directory path is resolved once rather than
+        once per archived file.
+        
+        Args:
+            names (Set[str]): Document names without extension
+        """
+        if not names:
+            return
+        history_dir = os.path.join(self.repo_path, "history")
+        
+        def is_history_file(filename: str) -> bool:
+            # Archived versions are named {name}_v{version}.md and .json
+            stem, extension = os.path.splitext(filename)
+            if extension not in (".md", ".json"):
+                return False
+            name, _, version = stem.rpartition("_v")
+            return version.isdecimal() and name in names
+        
+        if os.unlink in os.supports_dir_fd and os.scandir in os.supports_fd:
+            dir_fd = os.open(history_dir, os.O_RDONLY | getattr(os, "O_DIRECTORY", 0))
+            try:
+                with os.scandir(dir_fd) as entries:
+                    history_files = [entry.name for entry in entries if is_history_file(entry.name)]
+                for filename in history_files:
+                    os.unlink(filename, dir_fd=dir_fd)
+            finally:
+                os.close(dir_fd)
+        else:
+            with os.scandir(history_dir) as entries:
+                for entry in entries:
+                    if is_history_file(entry.name):
+                        os.remove(entry.path)
+    
     def get_doc(self, name: str) -> Optional[Doc]:
         """
         Get a document by name and return the Doc object.
@@ -944,8 +1697,14 @@ class DocRepo:
             self.logger.debug(f"Document {name} not found")
             return None
         
+        with self._doc_cache_lock:
+            doc = self._doc_cache.get(name)
+            if doc is None:
+                doc = Doc(name, self.repo_path, self.logger)
+                self._doc_cache[name] = doc
+        
         self.logger.debug(f"Retrieved document {name}")
-        return Doc(name, self.repo_path, self.logger)
+        return doc
     
     def get_docs_by_type(self, doc_type: str) -> List[Doc]:
         """
@@ -957,13 +1716,10 @@ class DocRepo:
         Returns:
             List[Doc]: List of Doc objects with the specified type
         """
-        docs = []
-        
         try:
-            for name in self.list_docs():
-                doc = self.get_doc(name)
-                if doc and doc.get_property("type") == doc_type:
-                    docs.append(doc)
+            # Only documents of the requested type are turned into Doc objects
+            matches = [name for name, value in self._scan_docs(self._doc_type) if value == doc_type]
+            docs = [doc for doc in map(self.get_doc, matches) if doc]
             
             self.logger.debug(f"Found {len(docs)} documents with type '{doc_type}'")
             return docs
@@ -991,13 +1747,13 @@ class DocRepo:
         result = {}
         
         try:
-            for name in self.list_docs():
-                doc = self.get_doc(name)
-                if doc:
-                    sections = doc.get_sections_with_tags(tags)
-                    
-                    if sections:
-                        result[name] = sections
+            # Normalize the tags once for all documents rather than in every one of them
+            normalized_tags = frozenset(tag.lower().strip('#') for tag in tags)
+            candidates = self._docs_with_all_tags(normalized_tags)
+            for name, sections in self._scan_docs(lambda name: self._doc_sections(name, normalized_tags),
+                                                  candidates):
+                if sections:
+                    result[name] = sections
             
             total_sections = sum(len(sections) for sections in result.values())
             self.logger.debug(f"Found {total_sections} sections with tags {tags} across {len(result)} documents")
@@ -1009,10 +1765,91 @@ class DocRepo:
             self.logger.error(f"Error getting sections with tags {tags}: {e}")
             raise RuntimeError(f"Error getting sections with tags {tags}: {e}") from e
     
+    def _docs_with_all_tags(self, normalized_tags: FrozenSet[str]) -> List[str]:
+        """
+        Find the documents whose sections use every one of the given tags.
+        
+        Only these documents can have sections matching all of the tags, so the
+        others need not be searched at all.
+        
+        Args:
+            normalized_tags (FrozenSet[str]): Validated, lowercased tags
+            
+        Returns:
+            List[str]: Names of the candidate documents
+        """
+        names = self.list_docs()
+        self._refresh_tag_index(names)
+        
+        if not normalized_tags:
+            return names
+        
+        # Intersect starting from the rarest tag to keep the working set small
+        postings = sorted((self._tag_index.get(tag, set()) for tag in normalized_tags), key=len)
+        candidates = set(postings[0])
+        for docs in postings[1:]:
+            candidates &= docs
+        return [name for name in names if name in candidates]
+    
+    def _refresh_tag_index(self, names: List[str]) -> None:
+        """
+        Bring the tag index up to date, re-reading only documents changed since indexed.
+        
+        Args:
+            names (List[str]): Names of all documents currently in the repository
+        """
+        live = set(names)
+        for name in [name for name in self._indexed_tags if name not in live]:
+            self._unindex_tags(name)
+        
+        stale = {}
+        for name in names:
+            md_file = os.path.join(self.repo_path, f"{name}.md")
+            try:
+                st = os.stat(md_file)
+            except FileNotFoundError:
+                self._unindex_tags(name)
+                continue
+            signature = (st.st_ino, st.st_size, st.st_mtime_ns)
+            
+            indexed = self._indexed_tags.get(name)
+            if indexed is None or indexed[0] != signature:
+                self._unindex_tags(name)
+                stale[name] = signature
+        
+        # Only the index itself is updated here; the changed documents are read
+        # like any other repo-wide scan
+        for name, doc_tags in self._scan_docs(self._doc_section_tags, list(stale)):
+            if doc_tags is None:
+                continue
+            self._indexed_tags[name] = (stale[name], doc_tags)
+            for tag in doc_tags:
+                self._tag_index.setdefault(tag, set()).add(name)
+    
+    def _unindex_tags(self, name: str) -> None:
+        """
+        Remove a document from the tag index.
+        
+        Args:
+            name (str): Name of the document
+        """
+        indexed = self._indexed_tags.pop(name, None)
+        if indexed is None:
+            return
+        for tag in indexed[1]:
+            docs = self._tag_index.get(tag)
+            if docs is not None:
+                docs.discard(name)
+                if not docs:
+                    del self._tag_index[tag]
+    
     def list_docs(self) -> List[str]:
         """
         List all document names in the repo.
         
+        The listing is cached and reused while the repository directory's mtime is
+        unchanged, since creating or deleting a file updates it.
+        
         Returns:
             List[str]: List of document names without extensions
         
@@ -1020,15 +1857,27 @@ class DocRepo:
             RuntimeError: If there's an error accessing the repository
         """
         try:
-            docs = set()
-            
-            for filename in os.listdir(self.repo_path):
-                if filename.endswith(".md") and os.path.isfile(os.path.join(self.repo_path, filename)):
-                    docs.add(filename[:-3])  # Remove .md extension
-            
-            result = sorted(list(docs))
+            mtime_ns = os.stat(self.repo_path).st_mtime_ns
+            cached = self._list_docs_cache
+            if cached is not None and cached[0] == mtime_ns:
+                return list(cached[1])
+            
+            scan_time_ns = time.time_ns()
+            # DirEntry.is_file() uses the file type from the directory read, so no
+            # per-file stat is needed
+            with os.scandir(self.repo_path) as entries:
+                docs = {entry.name[:-3] for entry in entries  # Remove .md extension
+                        if entry.name.endswith(".md") and entry.is_file()}
+            
+            result = sorted(docs)
+            # A change within the same timestamp tick as the scan would leave the mtime
+            # unchanged, so only cache listings of directories that were already settled
+            if scan_time_ns - mtime_ns > _MTIME_RACE_WINDOW_NS:
+                self._list_docs_cache = (mtime_ns, result)
+            else:
+                self._list_docs_cache = None
             self.logger.debug(f"Listed {len(result)} documents in the repository")
-            return result
+            return list(result)
         except Exception as e:
             self.logger.error(f"Error listing documents: {e}")
             raise RuntimeError(f"Error listing documents: {e}") from e
@@ -1044,17 +1893,11 @@ class DocRepo:
         Raises:
             RuntimeError: If there's an error accessing the documents
         """
-        all_tags = set()
-        
         try:
-            for name in self.list_docs():
-                doc = self.get_doc(name)
-                if doc:
-                    # Use the document's get_all_tags method
-                    doc_tags = doc.get_all_tags()
-                    all_tags.update(doc_tags)
-            
-            result = sorted(list(all_tags))
+            # Each document's get_all_tags is already sorted and unique, so merge the
+            # lists in order and drop the duplicates between documents
+            per_doc_tags = [doc_tags for _, doc_tags in self._scan_docs(self._doc_tags)]
+            result = [tag for tag, _ in itertools.groupby(heapq.merge(*per_doc_tags))]
             self.logger.debug(f"Found {len(result)} unique tags across all documents")
             return result
         except Exception as e:
@@ -1081,15 +1924,12 @@ class DocRepo:
         try:
             values = set()
             
-            for name in self.list_docs():
-                doc = self.get_doc(name)
-                if doc:
-                    value = doc.get_property(property_name)
-                    
-                    if value is not None:
-                        values.add(value)
+            for properties in self.get_all_properties().values():
+                value = properties.get(property_name)
+                if value is not None:
+                    values.add(value)
             
-            result = sorted(list(values), key=lambda x: str(x))
+            result = self._sort_property_values(values)
             self.logger.debug(f"Found {len(result)} unique values for property '{property_name}'")
             return result
         except ValueError:
@@ -1097,4 +1937,145 @@ class DocRepo:
             raise
         except Exception as e:
             self.logger.error(f"Error listing property values for '{property_name}': {e}")
-            raise RuntimeError(f"Error listing property values for '{property_name}': {e}") from e
\ No newline at end of file
+            raise RuntimeError(f"Error listing property values for '{property_name}': {e}") from e
+
+    def get_all_properties(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Get the properties of every document in the repo in one bulk read.
+        
+        Only the properties section of each document is read, and the reads are
+        issued concurrently for larger repos.
+        
+        Returns:
+            Dict[str, Dict[str, Any]]: Format {'docname': {property: value, ...}, ...}
+        
+        Raises:
+            RuntimeError: If there's an error accessing the documents
+        """
+        try:
+            result = dict(self._scan_docs(self._read_properties_only))
+            self.logger.debug(f"Read properties of {len(result)} documents")
+            return result
+        except Exception as e:
+            self.logger.error(f"Error reading properties of all documents: {e}")
+            raise RuntimeError(f"Error reading properties of all documents: {e}") from e
+    
+    def _scan_docs(self, worker: Callable[[str], Any],
+                   names: Optional[List[str]] = None) -> List[Tuple[str, Any]]:
+        """
+        Apply a function to the name of every document in the repo.
+        
+        Reading documents is I/O bound, so larger repos are scanned on a thread pool
+        to overlap the file reads. Results keep the order of list_docs.
+        
+        Args:
+            worker (Callable[[str], Any]): Function computing a per-document result
+            names (Optional[List[str]]): Documents to scan instead of all of them
+            
+        Returns:
+            List[Tuple[str, Any]]: (document name, result) pairs
+        """
+        if names is None:
+            names = self.list_docs()
+        
+        if len(names) < _PARALLEL_SCAN_MIN_DOCS:
+            results = [worker(name) for name in names]
+        else:
+            with ThreadPoolExecutor(max_workers=min(_SCAN_MAX_WORKERS, len(names))) as executor:
+                results = list(executor.map(worker, names))
+        
+        return list(zip(names, results))
+    
+    def _read_properties_only(self, name: str) -> Dict[str, Any]:
+        """
+        Read only the properties section of a document.
+        
+        Args:
+            name (str): Document name without extension
+            
+        Returns:
+            Dict[str, Any]: Document properties, or an empty dict if the document doesn't exist
+        """
+        doc = self._doc_cache.get(name)
+        if doc is not None:
+            return doc._load_properties_only()
+        md_file = os.path.join(self.repo_path, f"{name}.md")
+        return Doc._read_properties_from_file(md_file, self.logger)
+    
+    def _doc_type(self, name: str) -> Optional[str]:
+        """
+        Get the type property of a document without constructing a Doc.
+        
+        Args:
+            name (str): Document name without extension
+            
+        Returns:
+            Optional[str]: The document type, or None if it has none
+        """
+        return self._read_properties_only(name).get("type")
+    
+    def _doc_tags(self, name: str) -> List[str]:
+        """
+        Get all unique tags used in a document.
+        
+        Args:
+            name (str): Document name without extension
+            
+        Returns:
+            List[str]: Sorted list of unique tags, empty if the document doesn't exist
+        """
+        doc = self.get_doc(name)
+        return doc.get_all_tags() if doc else []
+    
+    def _doc_sections(self, name: str, normalized_tags: FrozenSet[str]) -> List[str]:
+        """
+        Get the sections of a document that contain all specified tags.
+        
+        Args:
+            name (str): Document name without extension
+            normalized_tags (FrozenSet[str]): Validated, lowercased tags
+            
+        Returns:
+            List[str]: Matching section texts, empty if the document doesn't exist
+        """
+        doc = self.get_doc(name)
+        return doc._matching_sections(normalized_tags) if doc else []
+    
+    def _doc_section_tags(self, name: str) -> Optional[Set[str]]:
+        """
+        Get every tag a document's sections can be matched on, lowercased.
+        
+        The sections are parsed through the Doc, which keeps them for the query
+        that follows.
+        
+        Args:
+            name (str): Document name without extension
+            
+        Returns:
+            Optional[Set[str]]: The tags, or None if the document doesn't exist
+        """
+        doc = self.get_doc(name)
+        if doc is None:
+            return None
+        return set().union(*(tags for _, tags in doc._sections()))
+    
+    @staticmethod
+    def _sort_property_values(values: Set[Any]) -> List[Any]:
+        """
+        Sort property values.
+        
+        When every value is a number, or every value is a string, they are sorted in
+        their natural order directly. Mixed types fall back to comparing their string
+        form, which needs a str() call per comparison key.
+        
+        Args:
+            values (Set[Any]): Unique property values
+            
+        Returns:
+            List[Any]: Sorted values
+        """
+        if all(isinstance(value, (int, float)) for value in values):
+            return sorted(values)
+        if all(isinstance(value, str) for value in values):
+            return sorted(values)
+        return sorted(values, key=str)
@@ -1,10 +1,12 @@
 import unittest
 import os
-import shutil
 import tempfile
 import logging
 import json
+import math
+import datetime
 import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, Any
 
 # Import the classes from your module - adjust this import as needed
@@ -19,24 +21,36 @@ sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
 
 from doc import Doc, DocRepo
 
+# Keep test repositories on tmpfs where available, as the code under test fsyncs
+# every write; set BOOKBOT_TEST_TMPDIR to use another location
+TEST_TMPDIR = os.environ.get('BOOKBOT_TEST_TMPDIR') or ('/dev/shm' if os.path.isdir('/dev/shm') else None)
+
+def get_test_logger(name):
+    """Get a logger for a test class, adding its console handler once per process."""
+    logger = logging.getLogger(name)
+    # Only warnings and errors are of interest, which also skips formatting debug records
+    logger.setLevel(logging.WARNING)
+    
+    if not logger.handlers:
+        handler = logging.StreamHandler()
+        formatter = logging.Formatter('%(levelname)s - %(message)s')
+        handler.setFormatter(formatter)
+        logger.addHandler(handler)
+    return logger
+
 class TestDoc(unittest.TestCase):
     """Test cases for the Doc class."""
     
+    @classmethod
+    def setUpClass(cls):
+        """Set up a logger shared by all tests in the class."""
+        cls.logger = get_test_logger('test_logger')
+    
     def setUp(self):
         """Set up the test environment before each test."""
         # Create a temporary directory for tests
-        self.test_dir = tempfile.mkdtemp()
-        
-        # Set up a logger for testing
-        self.logger = logging.getLogger('test_logger')
-        self.logger.setLevel(logging.DEBUG)
-        
-        # Create a console handler for the logger
-        handler = logging.StreamHandler()
-        handler.setLevel(logging.DEBUG)
-        formatter = logging.Formatter('%(levelname)s - %(message)s')
-        handler.setFormatter(formatter)
-        self.logger.addHandler(handler)
+        self._tmp = tempfile.TemporaryDirectory(dir=TEST_TMPDIR)
+        self.test_dir = self._tmp.name
         
         # Create a new document for testing
         self.doc_name = "test_doc"
@@ -45,7 +59,7 @@ class TestDoc(unittest.TestCase):
     def tearDown(self):
         """Clean up after each test."""
         # Remove the temporary directory and its contents
-        shutil.rmtree(self.test_dir)
+        self._tmp.cleanup()
     
     def test_init(self):
         """Test document initialization."""
@@ -64,6 +78,16 @@ class TestDoc(unittest.TestCase):
         self.assertEqual(properties["filename"], f"{self.doc_name}.md", "Filename property should be set")
         self.assertFalse(properties["complete"], "Document should not be marked as complete by default")
     
+    def test_init_existing_document(self):
+        """Test that opening an existing document keeps its files."""
+        self.doc.update_text("Existing text")
+        self.doc.set_json_data({"key": "value"})
+        
+        reopened = Doc(self.doc_name, self.test_dir, self.logger)
+        self.assertEqual(reopened.get_text(), "Existing text", "Text should be kept")
+        self.assertEqual(reopened.get_property("version"), 2, "Properties should be kept")
+        self.assertEqual(reopened.get_json_data(), {"key": "value"}, "JSON data should be kept")
+    
     def test_init_invalid_name(self):
         """Test initialization with invalid document name."""
         invalid_names = [
@@ -81,6 +105,22 @@ class TestDoc(unittest.TestCase):
             with self.assertRaises(ValueError, msg=f"Should reject invalid name: {name}"):
                 Doc(name, self.test_dir, self.logger)
     
+    def test_validate_name(self):
+        """Test which document names are accepted and how rejections are reported."""
+        for name in ["a", "chapter-1.draft", "Über_notes", "v1.2"]:
+            Doc._validate_name(name)
+        
+        reasons = {
+            "a/b": "path separators",
+            "a b": "invalid characters",
+            "": "invalid characters",
+            ".hidden": "cannot start with a dot",
+            "trailing.": "cannot end with a dot",
+        }
+        for name, reason in reasons.items():
+            with self.assertRaisesRegex(ValueError, reason, msg=f"Should reject {name!r} for {reason}"):
+                Doc._validate_name(name)
+    
     def test_get_text(self):
         """Test getting document text."""
         # Initially, document should be empty
@@ -156,6 +196,47 @@ class TestDoc(unittest.TestCase):
         self.doc.set_property("test_prop", "new_value")
         self.assertEqual(self.doc.get_property("test_prop"), "new_value", "Property should be updated correctly")
     
+    def test_set_property_unchanged_skips_write(self):
+        """Test that no-op property updates leave the file alone."""
+        self.doc.set_property("status", "draft")
+        self.doc.set_property("total_count", 10)
+        inode = os.stat(self.doc.md_file).st_ino
+        
+        self.doc.set_property("status", "draft")
+        self.doc.set_property("total_count", 0)
+        self.doc.set_properties({"status": "draft", "complete": False})
+        self.assertEqual(os.stat(self.doc.md_file).st_ino, inode, "Unchanged properties should not be rewritten")
+        
+        self.doc.set_property("total_count", 0.0)
+        self.assertEqual(self.doc.get_property("total_count"), 10.0, "Changing the type should be saved")
+        self.assertIsInstance(self.doc.get_property("total_count"), float, "Changing the type should be saved")
+    
+    def test_set_properties(self):
+        """Test setting several properties at once."""
+        self.doc.set_property("total_count", 10)
+        self.doc.update_text("Some text")
+        
+        self.doc.set_properties({"status": "draft", "priority": 2, "total_count": 5})
+        self.assertEqual(self.doc.get_property("status"), "draft", "Properties should be set")
+        self.assertEqual(self.doc.get_property("priority"), 2, "Properties should be set")
+        self.assertEqual(self.doc.get_property("total_count"), 15, "Total properties should be incremented")
+        self.assertEqual(self.doc.get_text(), "Some text", "Text should be unchanged")
+        
+        with self.assertRaises(ValueError):
+            self.doc.set_properties({"status": "final", "bad/key": 1})
+        self.assertEqual(self.doc.get_property("status"), "draft", "Invalid keys should reject the whole update")
+    
+    def test_property_keys_are_interned(self):
+        """Test that parsed property keys share one string object per key."""
+        other = Doc("other_doc", self.test_dir, self.logger)
+        key = "".join(["ty", "pe"])
+        self.doc.set_property(key, "note")
+        other.set_property(key, "note")
+        
+        key1 = next(k for k in self.doc.get_properties() if k == "type")
+        key2 = next(k for k in other.get_properties() if k == "type")
+        self.assertIs(key1, key2, "Property keys should be interned")
+    
     def test_set_property_total(self):
         """Test setting a total_* property."""
         # Set an initial total property
@@ -185,6 +266,40 @@ class TestDoc(unittest.TestCase):
         self.assertTrue(os.path.exists(os.path.join(history_dir, f"{self.doc_name}_v1.md")), "Version 1 should be archived")
         self.assertTrue(os.path.exists(os.path.join(history_dir, f"{self.doc_name}_v2.md")), "Version 2 should be archived")
     
+    def test_archived_versions_survive_later_writes(self):
+        """Test that archived versions keep their content after the document changes."""
+        self.doc.update_text("First")
+        self.doc.set_json_data({"step": 1})
+        self.doc.update_text("Second")
+        self.doc.set_json_data({"step": 2})
+        self.doc.set_property("status", "draft")
+        self.doc.update_text("Third", incr_version=False)
+        
+        self.assertEqual(self.doc.get_version_text(2), "First", "Version 2 should keep its text")
+        with open(os.path.join(self.test_dir, "history", f"{self.doc_name}_v2.json")) as f:
+            self.assertEqual(json.load(f), {"step": 1}, "Version 2 should keep its JSON data")
+        self.assertEqual(self.doc.get_version_properties(3)["status"], "draft",
+                         "Re-archiving a version should replace the old archive")
+    
+    def test_update_text_batch(self):
+        """Test applying several text updates at once."""
+        self.doc.update_text_batch([
+            ("First", {"status": "draft"}),
+            ("Second", None),
+            ("Third", {"status": "final"}),
+        ])
+        
+        self.assertEqual(self.doc.get_text(), "Third", "Last text should be current")
+        self.assertEqual(self.doc.get_property("version"), 4, "Each update should create a version")
+        self.assertEqual(self.doc.get_property("status"), "final", "Properties should be applied")
+        self.assertEqual(self.doc.get_version_text(3), "Second", "Intermediate versions should be archived")
+        self.assertEqual(self.doc.get_version_properties(3)["status"], "draft",
+                         "Properties should carry over to later versions")
+        
+        with self.assertRaises(ValueError):
+            self.doc.update_text_batch([("Fourth", {"bad/key": 1})])
+        self.assertEqual(self.doc.get_text(), "Third", "Invalid batches should not be applied")
+    
     def test_append_text(self):
         """Test appending text to a document."""
         # Set initial text
@@ -201,6 +316,46 @@ class TestDoc(unittest.TestCase):
         # Version should not change when appending text
         self.assertEqual(self.doc.get_property("version"), 2, "Version should remain the same after append")
     
+    def test_failed_save_leaves_document_intact(self):
+        """Test that a failed write keeps the old content and cleans up its temp file."""
+        self.doc.update_text("Original text")
+        
+        class Unprintable:
+            def __format__(self, spec):
+                raise ValueError("cannot format")
+        
+        with self.assertRaises(RuntimeError):
+            self.doc._save_properties_and_text({"bad": Unprintable()}, "New text")
+        
+        self.assertEqual(self.doc.get_text(), "Original text", "Document should be unchanged")
+        self.assertEqual(sorted(os.listdir(self.test_dir)), ["history", "test_doc.json", "test_doc.md"],
+                         "No temporary files should be left behind")
+    
+    def test_sections_reused_until_text_changes(self):
+        """Test that sections are parsed once per version of the text."""
+        self.doc.update_text("## One #a\nFirst\n\n## Two #b\nSecond")
+        sections = self.doc._sections()
+        self.assertIs(self.doc._sections(), sections, "Unchanged text should reuse the parsed sections")
+        matches = self.doc.get_sections_with_tags(["B"])
+        self.assertEqual(len(matches), 1, "Should match tags case-insensitively")
+        self.assertIn("Second", matches[0], "Should find the second section")
+        
+        self.doc.update_text("## One #b\nChanged")
+        matches = self.doc.get_sections_with_tags(["b"])
+        self.assertEqual(len(matches), 1, "Changed text should be parsed again")
+        self.assertIn("Changed", matches[0], "Changed text should be parsed again")
+        
+        self.doc.update_text("Plain text without headers")
+        self.assertEqual(self.doc._sections(), [], "Text without headers should have no sections")
+    
+    def test_get_all_tags(self):
+        """Test getting the inline tags of a document."""
+        self.doc.update_text("# Heading\nNo tags here.")
+        self.assertEqual(self.doc.get_all_tags(), [], "Text without # should have no tags")
+        
+        self.doc.update_text("# Heading\nSome #beta and #alpha text #beta")
+        self.assertEqual(self.doc.get_all_tags(), ["alpha", "beta"], "Should list unique inline tags")
+    
     def test_get_sections_with_tags(self):
         """Test getting sections with specific tags."""
         # Create a document with multiple sections and tags
@@ -301,6 +456,17 @@ This is section 1.
         versions = self.doc.get_versions()
         self.assertEqual(versions, [1, 2, 3], "All versions should be listed")
     
+    def test_get_versions_ignores_other_documents(self):
+        """Test that versions of similarly named documents are not mixed up."""
+        dotted = Doc("a.b", self.test_dir, self.logger)
+        lookalike = Doc("aXb", self.test_dir, self.logger)
+        extended = Doc("a.b_v2", self.test_dir, self.logger)
+        lookalike.update_text("Version 2")
+        lookalike.update_text("Version 3")
+        extended.update_text("Version 2")
+        
+        self.assertEqual(dotted.get_versions(), [1], "Only the document's own versions should be listed")
+    
     def test_get_version_text(self):
         """Test getting text of a specific version."""
         # Create multiple versions
@@ -336,6 +502,24 @@ This is section 1.
         self.assertEqual(v2_props.get("test_prop"), "value1", "Version 2 should have correct property value")
         self.assertEqual(v3_props.get("test_prop"), "value2", "Version 3 should have correct property value")
     
+    def test_get_version_bundle(self):
+        """Test getting properties and text of several versions at once."""
+        self.doc.update_text("Version 2 text")
+        self.doc.set_property("test_prop", "value1")
+        self.doc.update_text("Version 3 text")
+        
+        bundle = self.doc.get_version_bundle([1, 2, 3])
+        self.assertEqual(sorted(bundle), [1, 2, 3], "Should return every requested version")
+        for version in (1, 2, 3):
+            props, text = bundle[version]
+            self.assertEqual(props, self.doc.get_version_properties(version),
+                             f"Properties of version {version} should match")
+            self.assertEqual(text, self.doc.get_version_text(version),
+                             f"Text of version {version} should match")
+        
+        with self.assertRaises(ValueError, msg="Should raise ValueError for non-existent version"):
+            self.doc.get_version_bundle([1, 4])
+    
     def test_revert_to_version(self):
         """Test reverting to a previous version."""
         # Create multiple versions
@@ -393,6 +577,41 @@ This is section 1.
         # Check if data was updated correctly
         self.assertEqual(self.doc.get_json_data(), test_data2, "JSON data should be updated correctly")
     
+    def test_set_json_data_unchanged_skips_write(self):
+        """Test that setting identical JSON data leaves the file alone."""
+        self.doc.set_json_data({"count": 1})
+        inode = os.stat(self.doc.json_file).st_ino
+        
+        self.doc.set_json_data({"count": 1})
+        self.assertEqual(os.stat(self.doc.json_file).st_ino, inode, "Identical data should not be rewritten")
+        
+        self.doc.set_json_data({"count": True})
+        self.assertIs(self.doc.get_json_data()["count"], True, "Equal but differently typed data should be saved")
+    
+    def test_json_data_round_trip(self):
+        """Test JSON data that needs care from the serializer."""
+        test_data = {"title": "Café ☕", "big": 2 ** 70, "ratio": 0.5, "empty": None, "flags": [True, False]}
+        self.doc.set_json_data(test_data)
+        self.assertEqual(self.doc.get_json_data(), test_data, "JSON data should survive a round trip")
+        
+        with open(os.path.join(self.test_dir, f"{self.doc_name}.json"), "w") as f:
+            f.write("{not json")
+        self.assertEqual(self.doc.get_json_data(), {}, "Invalid JSON should read as empty")
+    
+    def test_json_data_matches_json_module(self):
+        """Test that JSON data is saved as the json module saves it, with or without orjson."""
+        test_data = {"ratio": float("nan"), "limit": float("inf")}
+        self.doc.set_json_data(test_data)
+        data = self.doc.get_json_data()
+        self.assertTrue(math.isnan(data["ratio"]), "NaN should be kept rather than saved as null")
+        self.assertEqual(data["limit"], float("inf"), "Infinity should be kept rather than saved as null")
+        
+        with self.assertRaises(TypeError, msg="The json module rejects datetimes"):
+            json.dumps({"saved": datetime.datetime(2024, 1, 1)}, indent=2)
+        with self.assertRaises(RuntimeError, msg="Datetimes should be rejected as by the json module"):
+            self.doc.set_json_data({"saved": datetime.datetime(2024, 1, 1)})
+        self.assertTrue(math.isnan(self.doc.get_json_data()["ratio"]), "Rejected data should not be saved")
+    
     def test_complete(self):
         """Test marking a document as complete."""
         # Check initial complete state
@@ -440,6 +659,56 @@ This is section 1.
         # Rollback should fail
         self.assertFalse(result, "Rollback should fail on a document with only one version")
     
+    def test_external_edit_invalidates_cache(self):
+        """Test that changes made to the file outside of Doc are picked up."""
+        self.doc.update_text("Cached text")
+        self.assertEqual(self.doc.get_text(), "Cached text", "Text should be read from the file")
+        
+        # Rewrite the file behind the Doc's back
+        with open(self.doc.md_file, 'w') as f:
+            f.write("version: 7\n---\nEdited outside")
+        
+        self.assertEqual(self.doc.get_text(), "Edited outside", "External edit should be detected")
+        self.assertEqual(self.doc.get_property("version"), 7, "External property change should be detected")
+    
+    def test_windows_line_endings(self):
+        """Test that files written with CRLF line endings read like LF files."""
+        with open(self.doc.md_file, 'wb') as f:
+            f.write("title: Café\r\n---\r\nLine one\r\nLine two\r\n".encode('utf-8'))
+        
+        self.assertEqual(self.doc.get_text(), "Line one\nLine two", "CRLF should be read as LF")
+        self.assertEqual(self.doc.get_property("title"), "Café", "Properties should be decoded as UTF-8")
+    
+    def test_properties_are_copies(self):
+        """Test that mutating returned properties doesn't affect the document."""
+        properties = self.doc.get_properties()
+        properties["version"] = 99
+        self.assertEqual(self.doc.get_property("version"), 1, "Returned properties should be a copy")
+    
+    def test_load_properties_only(self):
+        """Test reading just the properties section of a document."""
+        self.doc.set_property("type", "note")
+        self.doc.update_text("Body text\n---\nwith a separator-like line")
+        
+        # Cold read straight from the file
+        self.doc._parsed_cache = None
+        properties = self.doc._load_properties_only()
+        self.assertEqual(properties, self.doc.get_properties(), "Header-only read should match full parse")
+        self.assertEqual(properties["type"], "note", "Should read property from the header")
+        
+        # Files without a properties section have no properties
+        with open(self.doc.md_file, 'w') as f:
+            f.write("Just text")
+        self.assertEqual(self.doc._load_properties_only(), {}, "File without separator has no properties")
+        
+        # Separator split across reads, in a header longer than the first read
+        for separator_at in (8190, 8191, 8192, 20000):
+            padding = "x" * (separator_at - len("padding: \r\n"))
+            with open(self.doc.md_file, 'wb') as f:
+                f.write(f"padding: {padding}\r\n---\nBody".encode('utf-8'))
+            properties = Doc._read_properties_from_file(self.doc.md_file, self.logger)
+            self.assertEqual(properties, {"padding": padding}, f"Should find separator at offset {separator_at}")
+    
     def test_parse_property_value(self):
         """Test parsing of property values."""
         # Test parsing different value types
@@ -448,26 +717,30 @@ This is section 1.
         self.assertEqual(self.doc._parse_property_value("true"), True, "Should parse boolean true correctly")
         self.assertEqual(self.doc._parse_property_value("false"), False, "Should parse boolean false correctly")
         self.assertEqual(self.doc._parse_property_value("string"), "string", "Should keep string as is")
+        self.assertEqual(self.doc._parse_property_value("-7"), -7, "Should parse negative integer correctly")
+        self.assertEqual(self.doc._parse_property_value("1.5e-07"), 1.5e-07, "Should parse float exponent correctly")
+        self.assertEqual(self.doc._parse_property_value("1.2.3"), "1.2.3", "Should keep dotted version string as is")
+        self.assertEqual(self.doc._parse_property_value("TRUE"), True, "Should parse booleans case-insensitively")
+        self.assertEqual(self.doc._parse_property_value("fast"), "fast", "Should keep strings starting like a boolean")
+        self.assertEqual(self.doc._parse_property_value(""), "", "Should keep empty string as is")
+        self.assertEqual(self.doc._parse_property_value("1_000"), 1000, "Should parse underscore-grouped integer")
+        self.assertEqual(self.doc._parse_property_value("1_000.5"), 1000.5, "Should parse underscore-grouped float")
+        self.assertEqual(self.doc._parse_property_value("1__000"), "1__000", "Should keep repeated underscores as is")
 
 
 class TestDocRepo(unittest.TestCase):
     """Test cases for the DocRepo class."""
     
+    @classmethod
+    def setUpClass(cls):
+        """Set up a logger shared by all tests in the class."""
+        cls.logger = get_test_logger('test_repo_logger')
+    
     def setUp(self):
         """Set up the test environment before each test."""
         # Create a temporary directory for tests
-        self.test_dir = tempfile.mkdtemp()
-        
-        # Set up a logger for testing
-        self.logger = logging.getLogger('test_repo_logger')
-        self.logger.setLevel(logging.DEBUG)
-        
-        # Create a console handler for the logger
-        handler = logging.StreamHandler()
-        handler.setLevel(logging.DEBUG)
-        formatter = logging.Formatter('%(levelname)s - %(message)s')
-        handler.setFormatter(formatter)
-        self.logger.addHandler(handler)
+        self._tmp = tempfile.TemporaryDirectory(dir=TEST_TMPDIR)
+        self.test_dir = self._tmp.name
         
         # Create a document repository for testing
         self.repo = DocRepo(self.test_dir, self.logger)
@@ -475,7 +748,7 @@ class TestDocRepo(unittest.TestCase):
     def tearDown(self):
         """Clean up after each test."""
         # Remove the temporary directory and its contents
-        shutil.rmtree(self.test_dir)
+        self._tmp.cleanup()
     
     def test_init(self):
         """Test repository initialization."""
@@ -555,6 +828,55 @@ class TestDocRepo(unittest.TestCase):
         result = self.repo.delete_doc("nonexistent")
         self.assertFalse(result, "Deletion of non-existent document should fail")
     
+    def test_delete_doc_removes_history(self):
+        """Test that deleting a document removes its archived versions only."""
+        doc = self.repo.create_doc("test_doc")
+        doc.update_text("Version 2")
+        doc.update_text("Version 3")
+        other = self.repo.create_doc("other_doc")
+        other.update_text("Other version 2")
+        
+        self.repo.delete_doc("test_doc")
+        
+        history_files = os.listdir(os.path.join(self.test_dir, "history"))
+        self.assertFalse([f for f in history_files if f.startswith("test_doc_v")],
+                         "History of the deleted document should be removed")
+        self.assertIn("other_doc_v1.md", history_files, "History of other documents should be kept")
+        self.assertIn("other_doc_v1.json", history_files, "History of other documents should be kept")
+    
+    def test_create_doc_batch(self):
+        """Test creating several documents at once."""
+        docs = self.repo.create_doc_batch([
+            ("doc1", {"type": "note"}, "## Notes #idea"),
+            ("doc2", None, ""),
+        ])
+        
+        self.assertEqual([doc.name for doc in docs], ["doc1", "doc2"], "Should return the created documents")
+        self.assertEqual(self.repo.list_docs(), ["doc1", "doc2"], "Documents should be listed")
+        self.assertIs(self.repo.get_doc("doc1"), docs[0], "Created documents should be cached")
+        self.assertEqual(docs[0].get_property("type"), "note", "Initial properties should be set")
+        self.assertFalse(docs[1].get_property("complete"), "Documents should start incomplete")
+        
+        # Same result as creating the document on its own
+        single = self.repo.create_doc("doc3", initial_properties={"type": "note"}, initial_text="## Notes #idea")
+        self.assertEqual(docs[0].get_text(), single.get_text(), "Initial text should be set")
+        self.assertEqual(docs[0].get_versions(), single.get_versions(), "Versions should match create_doc")
+        
+        with self.assertRaises(ValueError):
+            self.repo.create_doc_batch([("doc4", None, ""), ("bad/name", None, "")])
+        self.assertIsNone(self.repo.get_doc("doc4"), "Invalid batches should create nothing")
+    
+    def test_delete_doc_batch(self):
+        """Test deleting several documents at once."""
+        self.repo.create_doc_batch([("doc1", None, "Text"), ("doc2", None, "Text"), ("doc1_v2", None, "Text")])
+        
+        self.assertEqual(self.repo.delete_doc_batch(["doc1", "doc2", "missing"]), [True, True, False],
+                         "Should report which documents were deleted")
+        self.assertEqual(self.repo.list_docs(), ["doc1_v2"], "Only the remaining document should be listed")
+        self.assertEqual(sorted(os.listdir(os.path.join(self.test_dir, "history"))),
+                         ["doc1_v2_v1.json", "doc1_v2_v1.md"],
+                         "History of documents with similar names should be kept")
+    
     def test_delete_doc_invalid_name(self):
         """Test deleting a document with invalid name."""
         with self.assertRaises(ValueError, msg="Should reject invalid name"):
@@ -576,35 +898,42 @@ class TestDocRepo(unittest.TestCase):
         doc = self.repo.get_doc("nonexistent")
         self.assertIsNone(doc, "Non-existent document should return None")
     
+    def test_get_doc_reuses_instance(self):
+        """Test that get_doc returns the same Doc instance for repeated lookups."""
+        self.repo.create_doc("test_doc")
+        
+        doc = self.repo.get_doc("test_doc")
+        self.assertIs(self.repo.get_doc("test_doc"), doc, "get_doc should reuse the Doc instance")
+        
+        # Deleted documents are no longer returned
+        self.repo.delete_doc("test_doc")
+        self.assertIsNone(self.repo.get_doc("test_doc"), "Deleted document should return None")
+    
+    def test_get_doc_from_threads(self):
+        """Test that concurrent lookups of a document share one Doc instance."""
+        self.repo.create_doc("test_doc")
+        fresh_repo = DocRepo(self.test_dir, self.logger)
+        
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            docs = list(executor.map(lambda _: fresh_repo.get_doc("test_doc"), range(32)))
+        
+        self.assertTrue(all(doc is docs[0] for doc in docs), "All threads should get the same Doc instance")
+    
     def test_get_doc_invalid_name(self):
         """Test getting a document with invalid name."""
         with self.assertRaises(ValueError, msg="Should reject invalid name"):
             self.repo.get_doc("../traversal")
     
-    def test_get_docs_by_type(self):
-        """Test getting documents by type."""
-        # Create documents with different types
+    def test_get_docs_by_type_only_loads_matches(self):
+        """Test that only matching documents are turned into Doc objects."""
         self.repo.create_doc("doc1", initial_properties={"type": "note"})
-        self.repo.create_doc("doc2", initial_properties={"type": "note"})
-        self.repo.create_doc("doc3", initial_properties={"type": "report"})
-        self.repo.create_doc("doc4", initial_properties={"type": "memo"})
+        self.repo.create_doc("doc2", initial_properties={"type": "report"})
         
-        # Get documents by type
-        note_docs = self.repo.get_docs_by_type("note")
-        report_docs = self.repo.get_docs_by_type("report")
-        memo_docs = self.repo.get_docs_by_type("memo")
-        nonexistent_docs = self.repo.get_docs_by_type("nonexistent")
-        
-        # Check if documents were retrieved properly
-        self.assertEqual(len(note_docs), 2, "Should find 2 note documents")
-        self.assertEqual(len(report_docs), 1, "Should find 1 report document")
-        self.assertEqual(len(memo_docs), 1, "Should find 1 memo document")
-        self.assertEqual(len(nonexistent_docs), 0, "Should find 0 nonexistent documents")
+        fresh_repo = DocRepo(self.test_dir, self.logger)
+        report_docs = fresh_repo.get_docs_by_type("report")
         
-        # Check if document names are correct
-        note_names = [doc.name for doc in note_docs]
-        self.assertIn("doc1", note_names, "doc1 should be a note")
-        self.assertIn("doc2", note_names, "doc2 should be a note")
+        self.assertEqual([doc.name for doc in report_docs], ["doc2"], "Should find the report document")
+        self.assertEqual(list(fresh_repo._doc_cache), ["doc2"], "Only the matching document should be loaded")
     
     def test_get_sections_with_tags(self):
         """Test getting sections with tags across all documents."""
@@ -643,7 +972,32 @@ This is section 2 in doc2.
         self.assertIn("doc1", sections, "Should find sections in doc1")
         self.assertEqual(len(sections["doc1"]), 1, "Should find 1 section in doc1")
         self.assertIn("Section 2", sections["doc1"][0], "Should find Section 2")
+        
+        # Tags given with their # prefix match the same sections
+        self.assertEqual(self.repo.get_sections_with_tags(["#tag1"]), self.repo.get_sections_with_tags(["tag1"]),
+                         "A # prefix on the query tag should be ignored")
     
+    def test_get_sections_with_tags_tracks_changes(self):
+        """Test that tag lookups follow edits, rollbacks and deletions."""
+        doc1 = self.repo.create_doc("doc1")
+        doc1.update_text("## Section 1 #tag1\nText.\n")
+        self.repo.create_doc("doc2", initial_text="## Section 1 #tag2\nText.\n")
+        
+        self.assertEqual(list(self.repo.get_sections_with_tags(["tag1"])), ["doc1"])
+        self.assertEqual(self.repo.get_sections_with_tags(["tag1", "tag2"]), {})
+        
+        # Same length as the original text, so only the file identity changes on rollback
+        doc1.update_text("## Section 1 #tag3\nText.\n")
+        self.assertEqual(list(self.repo.get_sections_with_tags(["TAG3"])), ["doc1"])
+        self.assertEqual(self.repo.get_sections_with_tags(["tag1"]), {})
+        
+        doc1.rollback()
+        self.assertEqual(list(self.repo.get_sections_with_tags(["tag1"])), ["doc1"])
+        
+        self.repo.delete_doc("doc2")
+        self.assertEqual(self.repo.get_sections_with_tags(["tag2"]), {})
+        self.assertNotIn("tag2", self.repo._tag_index)
+        
     def test_get_sections_with_tags_invalid_tag(self):
         """Test getting sections with invalid tags."""
         with self.assertRaises(ValueError, msg="Should reject invalid tag"):
@@ -681,33 +1035,22 @@ This is section 2 in doc2.
         self.assertIn("doc3", docs, "Should still list doc3")
         self.assertNotIn("doc2", docs, "Should not list deleted doc2")
     
-    def test_list_all_tags(self):
-        """Test listing all tags across all documents."""
-        # Create documents with tags
-        doc1 = self.repo.create_doc("doc1")
-        doc1.update_text("""## Section 1 #tag1 #tag2
-This is section 1.
-
-## Section 2 #tag3
-This is section 2.
-""")
-        
-        doc2 = self.repo.create_doc("doc2")
-        doc2.update_text("""## Section 1 #tag2 #tag4
-This is section 1.
-
-## Section 2 #tag5
-This is section 2.
-""")
-        
-        # List all tags
-        tags = self.repo.list_all_tags()
-        
-        # Check if all tags are listed
-        self.assertEqual(len(tags), 5, "Should list 5 tags")
-        expected_tags = ["tag1", "tag2", "tag3", "tag4", "tag5"]
-        for tag in expected_tags:
-            self.assertIn(tag, tags, f"Should list {tag}")
+    def test_list_docs_cache(self):
+        """Test that cached listings pick up changes to the repository directory."""
+        self.repo.create_doc("doc1")
+        self.assertEqual(self.repo.list_docs(), ["doc1"], "Should list doc1")
+        
+        # Documents created without going through the repo are still listed
+        Doc("doc2", self.test_dir, self.logger)
+        self.assertEqual(self.repo.list_docs(), ["doc1", "doc2"], "Should list doc2 created directly")
+        
+        # A settled directory is served from the cache until its mtime changes
+        settled = time.time() - 10
+        os.utime(self.test_dir, (settled, settled))
+        self.assertEqual(self.repo.list_docs(), ["doc1", "doc2"], "Should list both documents")
+        self.assertIsNotNone(self.repo._list_docs_cache, "Settled listing should be cached")
+        os.remove(os.path.join(self.test_dir, "doc2.md"))
+        self.assertEqual(self.repo.list_docs(), ["doc1"], "Should notice the removed document")
     
     def test_list_property_values(self):
         """Test listing all unique values for a property."""
@@ -733,16 +1076,116 @@ This is section 2.
         self.assertEqual(len(priority_values), 3, "Should list 3 unique priority values")
         self.assertEqual(priority_values, [1, 2, 3], "Should list priorities in order")
         
+        # Numeric values are sorted numerically, not by their string form
+        self.repo.create_doc("doc5", initial_properties={"priority": 10})
+        self.assertEqual(self.repo.list_property_values("priority"), [1, 2, 3, 10],
+                         "Should sort numeric values numerically")
+        
         # List values for a property that doesn't exist
         nonexistent_values = self.repo.list_property_values("nonexistent")
         self.assertEqual(nonexistent_values, [], "Should return empty list for non-existent property")
     
+    def test_scans_many_documents(self):
+        """Test repo-wide scans on a repository large enough to use the thread pool."""
+        for i in range(12):
+            doc = self.repo.create_doc(f"doc{i:02d}", initial_properties={"type": "even" if i % 2 == 0 else "odd",
+                                                                          "priority": i % 3})
+            doc.update_text(f"## Section #tag{i % 4}\nBody of doc {i}.")
+        
+        even_docs = self.repo.get_docs_by_type("even")
+        self.assertEqual([doc.name for doc in even_docs], [f"doc{i:02d}" for i in range(0, 12, 2)],
+                         "Should find the even documents in listing order")
+        self.assertEqual(self.repo.list_all_tags(), ["tag0", "tag1", "tag2", "tag3"], "Should list all tags")
+        self.assertEqual(self.repo.list_property_values("priority"), [0, 1, 2], "Should list all priorities")
+        self.assertEqual(list(self.repo.get_sections_with_tags(["tag1"])), ["doc01", "doc05", "doc09"],
+                         "Should find the tagged sections")
+        self.assertEqual(len(self.repo.get_sections_with_tags([])), 12, "No tags should match every document")
+    
+    def test_get_all_properties(self):
+        """Test reading the properties of every document at once."""
+        self.repo.create_doc("doc1", initial_properties={"type": "note"})
+        self.repo.create_doc("doc2", initial_properties={"type": "report", "priority": 2})
+        
+        all_properties = self.repo.get_all_properties()
+        
+        self.assertEqual(sorted(all_properties), ["doc1", "doc2"], "Should include every document")
+        self.assertEqual(all_properties["doc1"]["type"], "note", "Should read doc1 properties")
+        self.assertEqual(all_properties["doc2"]["priority"], 2, "Should read doc2 properties")
+        self.assertEqual(all_properties["doc2"], self.repo.get_doc("doc2").get_properties(),
+                         "Should match the document's own properties")
+    
     def test_list_property_values_invalid_property(self):
         """Test listing values for an invalid property name."""
         with self.assertRaises(ValueError, msg="Should reject invalid property name"):
             self.repo.list_property_values("property/name")
 
 
+class TestDocRepoQueries(unittest.TestCase):
+    """Test cases for DocRepo queries that only read a shared repository."""
+    
+    @classmethod
+    def setUpClass(cls):
+        """Build the repository once for all tests in the class, which must not modify it."""
+        cls.logger = get_test_logger('test_repo_logger')
+        
+        cls._tmp = tempfile.TemporaryDirectory(dir=TEST_TMPDIR)
+        cls.test_dir = cls._tmp.name
+        cls.repo = DocRepo(cls.test_dir, cls.logger)
+        
+        # Documents with different types, two of them with tags
+        cls.repo.create_doc_batch([
+            ("doc1", {"type": "note"}, """## Section 1 #tag1 #tag2
+This is section 1.
+
+## Section 2 #tag3
+This is section 2.
+"""),
+            ("doc2", {"type": "note"}, """## Section 1 #tag2 #tag4
+This is section 1.
+
+## Section 2 #tag5
+This is section 2.
+"""),
+            ("doc3", {"type": "report"}, ""),
+            ("doc4", {"type": "memo"}, ""),
+        ])
+    
+    @classmethod
+    def tearDownClass(cls):
+        """Clean up the shared repository."""
+        cls._tmp.cleanup()
+    
+    def test_get_docs_by_type(self):
+        """Test getting documents by type."""
+        # Get documents by type
+        note_docs = self.repo.get_docs_by_type("note")
+        report_docs = self.repo.get_docs_by_type("report")
+        memo_docs = self.repo.get_docs_by_type("memo")
+        nonexistent_docs = self.repo.get_docs_by_type("nonexistent")
+        
+        # Check if documents were retrieved properly
+        self.assertEqual(len(note_docs), 2, "Should find 2 note documents")
+        self.assertEqual(len(report_docs), 1, "Should find 1 report document")
+        self.assertEqual(len(memo_docs), 1, "Should find 1 memo document")
+        self.assertEqual(len(nonexistent_docs), 0, "Should find 0 nonexistent documents")
+        
+        # Check if document names are correct
+        note_names = [doc.name for doc in note_docs]
+        self.assertIn("doc1", note_names, "doc1 should be a note")
+        self.assertIn("doc2", note_names, "doc2 should be a note")
+    
+    def test_list_all_tags(self):
+        """Test listing all tags across all documents."""
+        # List all tags
+        tags = self.repo.list_all_tags()
+        
+        # Check if all tags are listed
+        self.assertEqual(len(tags), 5, "Should list 5 tags")
+        expected_tags = ["tag1", "tag2", "tag3", "tag4", "tag5"]
+        for tag in expected_tags:
+            self.assertIn(tag, tags, f"Should list {tag}")
+
+
 # Additional integration tests
 
 class TestDocRepoIntegration(unittest.TestCase):
@@ -751,7 +1194,8 @@ class TestDocRepoIntegration(unittest.TestCase):
     def setUp(self):
         """Set up the test environment before each test."""
         # Create a temporary directory for tests
-        self.test_dir = tempfile.mkdtemp()
+        self._tmp = tempfile.TemporaryDirectory(dir=TEST_TMPDIR)
+        self.test_dir = self._tmp.name
         
         # Set up a logger for testing
         self.logger = logging.getLogger('test_integration_logger')
@@ -763,7 +1207,7 @@ class TestDocRepoIntegration(unittest.TestCase):
     def tearDown(self):
         """Clean up after each test."""
         # Remove the temporary directory and its contents
-        shutil.rmtree(self.test_dir)
+        self._tmp.cleanup()
     
     def test_complete_and_rollback_workflow(self):
         """Test complete and rollback in a typical workflow."""
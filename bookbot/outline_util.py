@@ -7,12 +7,170 @@ character and setting information for specific chapters.
 """
 
 import re
+import sys
 import logging
-from typing import Dict, List, Optional, Tuple, Set
+import itertools
+from functools import lru_cache
+from typing import Dict, FrozenSet, List, Optional, Tuple, Set
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# Chapter headings ('## Chapter 3: Title #tag'): prefix, number and rest of the line
+_CHAPTER_RE = re.compile(r'^(## Chapter\s+)(\d+)(.*?)$', re.MULTILINE)
+
+# Just the start of a chapter heading and its number, for counting chapters and
+# reading a heading's number without scanning on to the end of the line
+_CHAPTER_NUM_RE = re.compile(r'^## Chapter\s+(\d+)', re.MULTILINE)
+
+# Classifies a heading line in one match: its level markers, whether it starts
+# with 'Chapter', and the chapter number when it is followed by one as a whole word
+_HEADING_RE = re.compile(r'(#+) (Chapter(?:\s+(\d+)\b)?)?')
+
+# Tags (#tag, #multi-word-tag) in a chapter heading
+_TAG_RE = re.compile(r'#(\w+(?:-\w+)*)')
+
+# Character and setting profiles: a level 1 heading with a tag, up to the next
+# level 1 heading or the end of the text
+_PROFILE_RE = re.compile(r'^# [^#]+#(\w+(?:-\w+)*)\s*$(.*?)(?=^# |\Z)', re.MULTILINE | re.DOTALL)
+
+# Number of distinct texts whose parsed form (chapter index, profile table) is kept
+_PARSE_CACHE_SIZE = 8
+
+# Number of joined profile texts (one per sheet and set of tags) that are kept
+_JOINED_CACHE_SIZE = 128
+
+class OutlineIndex:
+    """
+    Index of the chapters in an outline, built in a single pass over its lines.
+    
+    Each chapter number maps to the line of its heading, the line where its
+    content ends, its enclosing section heading and the previous chapter in
+    that section, so looking up a chapter doesn't rescan the outline. When a
+    chapter number appears more than once, the first heading wins.
+    """
+    
+    def __init__(self, outline_text: str):
+        """
+        Build the index for an outline.
+        
+        Args:
+            outline_text (str): The outline text
+        """
+        # Split once; the index is shared between lookups, so keep the lines immutable
+        self._lines: Tuple[str, ...] = tuple(outline_text.split('\n'))
+        
+        # Chapter number -> (heading line, enclosing section line, previous chapter line)
+        self._chapters: Dict[int, Tuple[int, int, int]] = {}
+        
+        # Chapter heading line -> line where that chapter's content ends
+        self._ends: Dict[int, int] = {}
+        
+        section_idx = -1
+        prev_chapter_idx = -1
+        open_chapter_idx = -1
+        
+        for i, line in enumerate(self._lines):
+            # Most lines are body text; only run the regex on lines that can be headings
+            if not line.startswith('#'):
+                continue
+            match = _HEADING_RE.match(line)
+            if not match:
+                continue
+            
+            # Any heading ends the content of the chapter before it
+            if open_chapter_idx != -1:
+                self._ends[open_chapter_idx] = i
+                open_chapter_idx = -1
+            
+            level = len(match.group(1))
+            if level == 1:
+                section_idx = i
+                prev_chapter_idx = -1
+            elif level == 2 and match.group(2):
+                if match.group(3):
+                    chapter_num = int(match.group(3))
+                    if chapter_num not in self._chapters:
+                        self._chapters[chapter_num] = (i, section_idx, prev_chapter_idx)
+                
+                open_chapter_idx = i
+                prev_chapter_idx = i
+        
+        if open_chapter_idx != -1:
+            self._ends[open_chapter_idx] = len(self._lines)
+    
+    def __contains__(self, chapter_num: int) -> bool:
+        return chapter_num in self._chapters
+    
+    def chapter_numbers(self) -> List[int]:
+        """
+        Get the numbers of the indexed chapters.
+        
+        Returns:
+            List[int]: The chapter numbers, in the order they first appear in the outline
+        """
+        return list(self._chapters)
+    
+    def chapter_heading(self, chapter_num: int) -> Optional[str]:
+        """
+        Get the heading line for a chapter.
+        
+        Args:
+            chapter_num (int): The chapter number to find
+            
+        Returns:
+            Optional[str]: The chapter heading line if found, None otherwise
+        """
+        entry = self._chapters.get(chapter_num)
+        if entry is None:
+            return None
+        return self._lines[entry[0]]
+    
+    def chapter_content(self, chapter_num: int) -> Optional[Tuple[str, str, str]]:
+        """
+        Get the heading, content and preceding content for a chapter.
+        
+        Args:
+            chapter_num (int): The chapter number to find
+            
+        Returns:
+            Optional[Tuple[str, str, str]]: The chapter heading, the chapter content
+                and the preceding section or content, or None if the chapter is not found
+        """
+        entry = self._chapters.get(chapter_num)
+        if entry is None:
+            return None
+        
+        chapter_line_idx, section_idx, prev_chapter_idx = entry
+        lines = self._lines
+        
+        chapter_content = '\n'.join(lines[chapter_line_idx + 1:self._ends[chapter_line_idx]])
+        
+        if section_idx == -1:
+            # Not inside a section, so there is no preceding content
+            preceding_content = ""
+        elif prev_chapter_idx != -1:
+            # The previous chapter in this section, up to its first subheading
+            preceding_content = '\n'.join(lines[prev_chapter_idx:self._ends[prev_chapter_idx]])
+        else:
+            # This is the first chapter in the section, get section intro
+            preceding_content = '\n'.join(lines[section_idx:chapter_line_idx])
+        
+        return lines[chapter_line_idx], chapter_content, preceding_content
+
+@lru_cache(maxsize=_PARSE_CACHE_SIZE)
+def _outline_index(outline_text: str) -> OutlineIndex:
+    """
+    Get the chapter index for an outline, reusing it across chapter lookups.
+    
+    Args:
+        outline_text (str): The outline text
+        
+    Returns:
+        OutlineIndex: The index of the outline's chapters
+    """
+    return OutlineIndex(outline_text)
+
 def renumber_chapters(outline_text: str) -> str:
     """
     Renumber all chapters in the outline sequentially.
@@ -26,31 +184,20 @@ def renumber_chapters(outline_text: str) -> str:
     Returns:
         str: The outline with chapters renumbered sequentially
     """
-    # Regular expression to match chapter headings
-    chapter_pattern = re.compile(r'^(## Chapter\s+)(\d+)(.*?)$', re.MULTILINE)
+    chapter_nums = itertools.count(1)  # New chapter numbers (1-based)
     
-    # Find all chapter headings
-    matches = list(chapter_pattern.finditer(outline_text))
+    def renumber(match: re.Match) -> str:
+        # Keep the '## Chapter ' prefix and everything after the number
+        return f"{match.group(1)}{next(chapter_nums)}{match.group(3)}"
     
-    if not matches:
+    # Rewrite every chapter heading in a single substitution pass
+    new_text, chapter_count = _CHAPTER_RE.subn(renumber, outline_text)
+    
+    if not chapter_count:
         logger.warning("No chapters found in the outline to renumber.")
         return outline_text
     
-    # Create a copy of the text that we'll modify
-    new_text = outline_text
-    
-    # Process matches in reverse order to avoid position shifts
-    for i, match in reversed(list(enumerate(matches))):
-        chapter_num = i + 1  # New chapter number (1-based)
-        
-        # Replace the old chapter heading with the new one
-        prefix = match.group(1)  # '## Chapter '
-        suffix = match.group(3)  # Everything after the number
-        
-        new_heading = f"{prefix}{chapter_num}{suffix}"
-        new_text = new_text[:match.start()] + new_heading + new_text[match.end():]
-    
-    logger.info(f"Renumbered {len(matches)} chapters in the outline.")
+    logger.info("Renumbered %d chapters in the outline.", chapter_count)
     return new_text
 
 def count_chapters(outline_text: str) -> int:
@@ -63,14 +210,10 @@ def count_chapters(outline_text: str) -> int:
     Returns:
         int: The number of chapters found in the outline
     """
-    # Regular expression to match chapter headings
-    chapter_pattern = re.compile(r'^## Chapter\s+\d+', re.MULTILINE)
-    
-    # Find all chapter headings
-    matches = list(chapter_pattern.finditer(outline_text))
-    chapter_count = len(matches)
+    # Count the chapter headings without keeping their matches
+    chapter_count = sum(1 for _ in _CHAPTER_NUM_RE.finditer(outline_text))
     
-    logger.info(f"Found {chapter_count} chapters in the outline.")
+    logger.info("Found %d chapters in the outline.", chapter_count)
     return chapter_count
 
 def extract_tags(chapter_heading: str) -> Tuple[int, Set[str]]:
@@ -83,25 +226,19 @@ def extract_tags(chapter_heading: str) -> Tuple[int, Set[str]]:
     Returns:
         Tuple[int, Set[str]]: The chapter number and a set of tags
     """
-    # Regular expression to match chapter number
-    chapter_num_pattern = re.compile(r'^## Chapter\s+(\d+)')
-    chapter_match = chapter_num_pattern.search(chapter_heading)
+    # Match the chapter number at the start of the heading
+    chapter_match = _CHAPTER_NUM_RE.match(chapter_heading)
     
     if not chapter_match:
-        logger.error(f"Could not extract chapter number from heading: {chapter_heading}")
+        logger.error("Could not extract chapter number from heading: %s", chapter_heading)
         return 0, set()
     
     chapter_num = int(chapter_match.group(1))
     
-    # Extract tags (words that start with #, excluding the initial ## for the heading)
-    tags = set()
-    tag_pattern = re.compile(r'#(\w+(?:-\w+)*)')
-    
-    for match in tag_pattern.finditer(chapter_heading):
-        tag = match.group(1)
-        # Skip tags that are just the heading level marker
-        if tag != '#':
-            tags.add(tag)
+    # Extract tags (words that start with #; the ## heading marker is not followed
+    # by a word character, so it never matches). Tags repeat across chapters and
+    # profile sheets, so intern them to share one string per tag.
+    tags = {sys.intern(tag) for tag in _TAG_RE.findall(chapter_heading)}
     
     return chapter_num, tags
 
@@ -116,14 +253,11 @@ def find_chapter_heading(outline_text: str, chapter_num: int) -> Optional[str]:
     Returns:
         Optional[str]: The chapter heading line if found, None otherwise
     """
-    # Regular expression to match the specific chapter heading
-    chapter_pattern = re.compile(f'^## Chapter\\s+{chapter_num}.*?$', re.MULTILINE)
+    heading = _outline_index(outline_text).chapter_heading(chapter_num)
+    if heading is not None:
+        return heading
     
-    match = chapter_pattern.search(outline_text)
-    if match:
-        return match.group(0)
-    
-    logger.warning(f"Chapter {chapter_num} not found in outline.")
+    logger.warning("Chapter %s not found in outline.", chapter_num)
     return None
 
 def find_chapter_content(outline_text: str, chapter_num: int) -> Optional[Tuple[str, str, str]]:
@@ -141,72 +275,70 @@ def find_chapter_content(outline_text: str, chapter_num: int) -> Optional[Tuple[
             - The preceding section or content
         Returns None if the chapter is not found.
     """
-    # Split the outline into lines
-    lines = outline_text.split('\n')
-    
-    # Find the line number of the requested chapter
-    chapter_line_idx = -1
-    for i, line in enumerate(lines):
-        if re.match(f'^## Chapter\\s+{chapter_num}\\b', line):
-            chapter_line_idx = i
-            break
-    
-    if chapter_line_idx == -1:
-        logger.warning(f"Chapter {chapter_num} not found in outline.")
-        return None
-    
-    # Get the chapter heading
-    chapter_heading = lines[chapter_line_idx]
-    
-    # Find the end of the chapter content
-    end_idx = len(lines)
-    for i in range(chapter_line_idx + 1, len(lines)):
-        # Stop at the next chapter or section heading
-        if re.match(r'^#+ ', lines[i]):
-            end_idx = i
-            break
-    
-    # Extract the chapter content
-    chapter_content = '\n'.join(lines[chapter_line_idx + 1:end_idx])
-    
-    # Find the preceding section or content
-    preceding_content = ""
-    section_start_idx = -1
-    
-    # Look backward to find the containing section, if any
-    for i in range(chapter_line_idx - 1, -1, -1):
-        if re.match(r'^# ', lines[i]):
-            section_start_idx = i
-            break
-    
-    # If this is the first chapter in a section, get content between section heading and chapter
-    if section_start_idx != -1:
-        # Find the previous chapter in the same section, if any
-        prev_chapter_idx = -1
-        for i in range(chapter_line_idx - 1, section_start_idx, -1):
-            if re.match(r'^## Chapter', lines[i]):
-                prev_chapter_idx = i
-                break
+    chapter_info = _outline_index(outline_text).chapter_content(chapter_num)
+    if chapter_info is None:
+        logger.warning("Chapter %s not found in outline.", chapter_num)
+    
+    return chapter_info
+
+@lru_cache(maxsize=_PARSE_CACHE_SIZE)
+def _parse_profiles(profile_text: str) -> Dict[str, Tuple[int, str]]:
+    """
+    Parse character or setting profiles into a table keyed by tag.
+    
+    The same character and setting texts are passed in for every chapter of a
+    book, so the parsed table is cached per text. Callers must not modify it.
+    
+    Args:
+        profile_text (str): The full character sheets or setting profiles text
         
-        if prev_chapter_idx != -1:
-            # There's a previous chapter in this section
-            # Get content from the end of that chapter to the start of this one
-            prev_chapter_end_idx = -1
-            for i in range(prev_chapter_idx + 1, chapter_line_idx):
-                if re.match(r'^#+ ', lines[i]):
-                    prev_chapter_end_idx = i - 1
-                    break
-            
-            if prev_chapter_end_idx == -1:
-                # No subsections found, use all content
-                preceding_content = '\n'.join(lines[prev_chapter_idx:chapter_line_idx])
-            else:
-                preceding_content = '\n'.join(lines[prev_chapter_idx:prev_chapter_end_idx + 1])
-        else:
-            # This is the first chapter in the section, get section intro
-            preceding_content = '\n'.join(lines[section_start_idx:chapter_line_idx])
+    Returns:
+        Dict[str, Tuple[int, str]]: Dictionary mapping tags to the position of
+            their first profile in the text and their (last) profile
+    """
+    profiles = {}
+    for match in _PROFILE_RE.finditer(profile_text):
+        tag = sys.intern(match.group(1))
+        position = profiles[tag][0] if tag in profiles else len(profiles)
+        profiles[tag] = (position, match.group(0))
+    return profiles
+
+def _select_profiles(profile_text: str, tags: Set[str]) -> Dict[str, str]:
+    """
+    Look up the profiles for a set of tags.
+    
+    Only the requested tags are looked up, so the cost follows the number of
+    tags rather than the number of profiles in the text.
     
-    return chapter_heading, chapter_content, preceding_content
+    Args:
+        profile_text (str): The full character sheets or setting profiles text
+        tags (Set[str]): The set of tags to look up
+        
+    Returns:
+        Dict[str, str]: Dictionary mapping the tags found to their profiles, in text order
+    """
+    profiles = _parse_profiles(profile_text)
+    found = sorted((profiles[tag] + (tag,) for tag in tags if tag in profiles))
+    return {tag: profile for _, profile, tag in found}
+
+@lru_cache(maxsize=_JOINED_CACHE_SIZE)
+def _join_profiles(profile_text: str, tags: FrozenSet[str]) -> Tuple[str, FrozenSet[str]]:
+    """
+    Join the profiles for a set of tags into a single text.
+    
+    Chapters that share a cast reuse the joined text instead of looking up and
+    joining the same profiles again.
+    
+    Args:
+        profile_text (str): The full character sheets or setting profiles text
+        tags (FrozenSet[str]): The set of tags to include
+        
+    Returns:
+        Tuple[str, FrozenSet[str]]: The profiles found, in text order and separated
+            by blank lines, and the tags that have no profile
+    """
+    profiles = _select_profiles(profile_text, tags)
+    return "\n\n".join(profiles.values()), tags.difference(profiles)
 
 def get_character_profiles(character_text: str, tags: Set[str]) -> Dict[str, str]:
     """
@@ -219,21 +351,11 @@ def get_character_profiles(character_text: str, tags: Set[str]) -> Dict[str, str
     Returns:
         Dict[str, str]: Dictionary mapping character tags to their profiles
     """
-    character_profiles = {}
-    
-    # Regular expression to find character sections
-    # Match from a level 1 heading with a tag to the next level 1 heading or end of text
-    pattern = re.compile(r'^# [^#]+#(\w+(?:-\w+)*)\s*$(.*?)(?=^# |\Z)', re.MULTILINE | re.DOTALL)
-    
-    for match in pattern.finditer(character_text):
-        tag = match.group(1)
-        if tag in tags:
-            profile = match.group(0)
-            character_profiles[tag] = profile
+    character_profiles = _select_profiles(character_text, tags)
     
     missing_tags = tags - set(character_profiles.keys())
     if missing_tags:
-        logger.warning(f"Could not find character profiles for tags: {missing_tags}")
+        logger.warning("Could not find character profiles for tags: %s", missing_tags)
     
     return character_profiles
 
@@ -248,24 +370,56 @@ def get_setting_profiles(setting_text: str, tags: Set[str]) -> Dict[str, str]:
     Returns:
         Dict[str, str]: Dictionary mapping setting tags to their profiles
     """
-    setting_profiles = {}
-    
-    # Regular expression to find setting sections
-    # Match from a level 1 heading with a tag to the next level 1 heading or end of text
-    pattern = re.compile(r'^# [^#]+#(\w+(?:-\w+)*)\s*$(.*?)(?=^# |\Z)', re.MULTILINE | re.DOTALL)
-    
-    for match in pattern.finditer(setting_text):
-        tag = match.group(1)
-        if tag in tags:
-            profile = match.group(0)
-            setting_profiles[tag] = profile
+    setting_profiles = _select_profiles(setting_text, tags)
     
     missing_tags = tags - set(setting_profiles.keys())
     if missing_tags:
-        logger.warning(f"Could not find setting profiles for tags: {missing_tags}")
+        logger.warning("Could not find setting profiles for tags: %s", missing_tags)
     
     return setting_profiles
 
+def _assemble_chapter_content(chapter_info: Tuple[str, str, str],
+                              character_text: str, setting_text: str) -> Dict[str, str]:
+    """
+    Combine a chapter's outline content with its character and setting profiles.
+    
+    Args:
+        chapter_info (Tuple[str, str, str]): The chapter heading, content and preceding content
+        character_text (str): The full character sheets text
+        setting_text (str): The full setting profiles text
+        
+    Returns:
+        Dict[str, str]: The chapter content dictionary described in get_chapter_content
+    """
+    chapter_heading, chapter_content, preceding_content = chapter_info
+    
+    # Extract tags from the chapter heading
+    _, tags = extract_tags(chapter_heading)
+    
+    # Get the combined character and setting profiles
+    tag_key = frozenset(tags)
+    characters_text, missing_tags = _join_profiles(character_text, tag_key)
+    if missing_tags:
+        logger.warning("Could not find character profiles for tags: %s", set(missing_tags))
+    
+    settings_text, missing_tags = _join_profiles(setting_text, tag_key)
+    if missing_tags:
+        logger.warning("Could not find setting profiles for tags: %s", set(missing_tags))
+    
+    # Create the result dictionary
+    result = {
+        'chapter_heading': chapter_heading,
+        'chapter_content': chapter_content,
+        'preceding_content': preceding_content,
+        'characters': characters_text,
+        'settings': settings_text,
+        'all_content': (f"{preceding_content}\n\n{chapter_heading}\n{chapter_content}\n\n"
+                        f"CHARACTERS:\n{characters_text}\n\n"
+                        f"SETTINGS:\n{settings_text}")
+    }
+    
+    return result
+
 def get_chapter_content(outline_text: str, chapter_num: int, 
                         character_text: str, setting_text: str) -> Dict[str, str]:
     """
@@ -301,36 +455,30 @@ def get_chapter_content(outline_text: str, chapter_num: int,
         if not chapter_info:
             raise ValueError(f"Chapter {chapter_num} not found in outline.")
         
-        chapter_heading, chapter_content, preceding_content = chapter_info
-        
-        # Extract tags from the chapter heading
-        _, tags = extract_tags(chapter_heading)
-        
-        # Get character and setting profiles
-        character_profiles = get_character_profiles(character_text, tags)
-        setting_profiles = get_setting_profiles(setting_text, tags)
-        
-        # Combine character profiles
-        characters_text = "\n\n".join(character_profiles.values())
-        
-        # Combine setting profiles
-        settings_text = "\n\n".join(setting_profiles.values())
-        
-        # Create the result dictionary
-        result = {
-            'chapter_heading': chapter_heading,
-            'chapter_content': chapter_content,
-            'preceding_content': preceding_content,
-            'characters': characters_text,
-            'settings': settings_text,
-            'all_content': f"{preceding_content}\n\n{chapter_heading}\n{chapter_content}\n\n" + 
-                          f"CHARACTERS:\n{characters_text}\n\n" +
-                          f"SETTINGS:\n{settings_text}"
-        }
-        
-        return result
+        return _assemble_chapter_content(chapter_info, character_text, setting_text)
     
     except Exception as e:
-        logger.error(f"Error getting content for chapter {chapter_num}: {e}")
+        logger.error("Error getting content for chapter %s: %s", chapter_num, e)
         raise
-    
\ No newline at end of file
+
+def get_all_chapters_content(outline_text: str, character_text: str,
+                             setting_text: str) -> Dict[int, Dict[str, str]]:
+    """
+    Get the content needed to write every chapter in the outline.
+    
+    The outline, character sheets and setting profiles are each parsed once for
+    the whole book rather than once per chapter.
+    
+    Args:
+        outline_text (str): The outline text
+        character_text (str): The full character sheets text
+        setting_text (str): The full setting profiles text
+        
+    Returns:
+        Dict[int, Dict[str, str]]: Dictionary mapping each chapter number to the same
+            content dictionary get_chapter_content returns, in outline order
+    """
+    index = _outline_index(outline_text)
+    return {chapter_num: _assemble_chapter_content(index.chapter_content(chapter_num),
+                                                   character_text, setting_text)
+            for chapter_num in index.chapter_numbers()}
@@ -19,10 +19,11 @@ import outline_util
 class TestOutlineUtil(unittest.TestCase):
     """Test cases for outline_util module functions."""
 
-    def setUp(self):
-        """Set up test fixtures."""
+    @classmethod
+    def setUpClass(cls):
+        """Set up test fixtures shared by all tests; none of the tests modify them."""
         # Sample outline with some common patterns and edge cases
-        self.sample_outline = """# Section 1: Introduction
+        cls.sample_outline = """# Section 1: Introduction
 
 This is the introduction to the story, setting up the main themes.
 
@@ -67,7 +68,7 @@ John and Mary are pursued through the city by someone wanting the package.
 """
 
         # Sample character sheets
-        self.sample_characters = """# John Smith #john
+        cls.sample_characters = """# John Smith #john
 Age: 35
 Occupation: Professor of archaeology
 Description: Tall with brown hair and glasses, always wears a tweed jacket.
@@ -89,7 +90,7 @@ Description: Long black hair, serious demeanor, dresses elegantly.
 """
 
         # Sample setting profiles
-        self.sample_settings = """# John's Home #home
+        cls.sample_settings = """# John's Home #home
 A cozy suburban house with a small garden.
 Located in a quiet neighborhood with tree-lined streets.
 The living room has comfortable furniture and walls lined with books.
@@ -170,43 +171,39 @@ Content
 
     def test_extract_tags(self):
         """Test the extract_tags function with various inputs."""
-        # Test normal case with multiple tags
-        chapter_heading = "## Chapter 1: The Beginning #john #mary #home"
-        chapter_num, tags = outline_util.extract_tags(chapter_heading)
-        self.assertEqual(1, chapter_num)
-        self.assertEqual({"john", "mary", "home"}, tags)
-        
-        # Test with hyphenated tag
-        chapter_heading = "## Chapter 2: Journey #train-station #john"
-        chapter_num, tags = outline_util.extract_tags(chapter_heading)
-        self.assertEqual(2, chapter_num)
-        self.assertEqual({"train-station", "john"}, tags)
-        
-        # Test with no tags
-        chapter_heading = "## Chapter 3: No Tags"
-        chapter_num, tags = outline_util.extract_tags(chapter_heading)
-        self.assertEqual(3, chapter_num)
-        self.assertEqual(set(), tags)
-        
-        # Test with invalid heading
-        chapter_heading = "# Section 1: Not a chapter"
-        chapter_num, tags = outline_util.extract_tags(chapter_heading)
-        self.assertEqual(0, chapter_num)
-        self.assertEqual(set(), tags)
+        cases = [
+            # Normal case with multiple tags
+            ("## Chapter 1: The Beginning #john #mary #home", 1, {"john", "mary", "home"}),
+            # Hyphenated tag
+            ("## Chapter 2: Journey #train-station #john", 2, {"train-station", "john"}),
+            # No tags
+            ("## Chapter 3: No Tags", 3, set()),
+            # Invalid heading
+            ("# Section 1: Not a chapter", 0, set()),
+        ]
+        
+        for chapter_heading, expected_num, expected_tags in cases:
+            with self.subTest(chapter_heading=chapter_heading):
+                chapter_num, tags = outline_util.extract_tags(chapter_heading)
+                self.assertEqual(expected_num, chapter_num)
+                self.assertEqual(expected_tags, tags)
 
     def test_find_chapter_heading(self):
         """Test the find_chapter_heading function with various inputs."""
-        # Test normal case
-        heading = outline_util.find_chapter_heading(self.sample_outline, 1)
-        self.assertEqual("## Chapter 1: The Beginning #john #mary #home", heading)
-        
-        # Test chapter that doesn't exist
-        heading = outline_util.find_chapter_heading(self.sample_outline, 10)
-        self.assertIsNone(heading)
-        
-        # Test with empty outline
-        heading = outline_util.find_chapter_heading("", 1)
-        self.assertIsNone(heading)
+        cases = [
+            # Normal case
+            (self.sample_outline, 1, "## Chapter 1: The Beginning #john #mary #home"),
+            # Chapter that doesn't exist
+            (self.sample_outline, 10, None),
+            # Empty outline
+            ("", 1, None),
+            # The chapter number is matched as a whole number
+            ("## Chapter 12: Later #john\n\n## Chapter 1: Start #mary", 1, "## Chapter 1: Start #mary"),
+        ]
+        
+        for outline, chapter_num, expected in cases:
+            with self.subTest(outline=outline[:40], chapter_num=chapter_num):
+                self.assertEqual(expected, outline_util.find_chapter_heading(outline, chapter_num))
 
     def test_find_chapter_content(self):
         """Test the find_chapter_content function with various inputs."""
@@ -216,8 +213,8 @@ Content
         heading, content, preceding = result
         
         self.assertEqual("## Chapter 2: The Journey Begins #john #mary #train-station", heading)
-        self.assertTrue(content.startswith("SETTING: Central Train Station"))
-        self.assertTrue(preceding.startswith("## Chapter 1: The Beginning"))
+        self.assertRegex(content, r"^SETTING: Central Train Station")
+        self.assertRegex(preceding, r"^## Chapter 1: The Beginning")
         
         # Test first chapter in a section
         result = outline_util.find_chapter_content(self.sample_outline, 1)
@@ -225,8 +222,8 @@ Content
         heading, content, preceding = result
         
         self.assertEqual("## Chapter 1: The Beginning #john #mary #home", heading)
-        self.assertTrue(content.startswith("SETTING: John's home"))
-        self.assertTrue(preceding.startswith("# Section 1: Introduction"))
+        self.assertRegex(content, r"^SETTING: John's home")
+        self.assertRegex(preceding, r"^# Section 1: Introduction")
         
         # Test first chapter in a later section
         result = outline_util.find_chapter_content(self.sample_outline, 3)
@@ -234,13 +231,27 @@ Content
         heading, content, preceding = result
         
         self.assertEqual("## Chapter 3: Arrival #john #mary #bob #hotel", heading)
-        self.assertTrue(content.startswith("SETTING: Grand Hotel"))
-        self.assertTrue(preceding.startswith("# Section 2: Development"))
+        self.assertRegex(content, r"^SETTING: Grand Hotel")
+        self.assertRegex(preceding, r"^# Section 2: Development")
         
         # Test chapter that doesn't exist
         result = outline_util.find_chapter_content(self.sample_outline, 10)
         self.assertIsNone(result)
 
+    def test_outline_index(self):
+        """Test that OutlineIndex answers lookups like find_chapter_content."""
+        index = outline_util.OutlineIndex(self.sample_outline)
+        
+        for chapter_num in (1, 2, 3, 5):
+            self.assertIn(chapter_num, index)
+            self.assertEqual(outline_util.find_chapter_content(self.sample_outline, chapter_num),
+                             index.chapter_content(chapter_num))
+        
+        # Test chapter that doesn't exist
+        self.assertNotIn(4, index)
+        self.assertIsNone(index.chapter_heading(4))
+        self.assertIsNone(index.chapter_content(4))
+
     def test_get_character_profiles(self):
         """Test the get_character_profiles function with various inputs."""
         # Test normal case with multiple existing tags
@@ -250,8 +261,8 @@ Content
         self.assertEqual(2, len(profiles))
         self.assertIn("john", profiles)
         self.assertIn("mary", profiles)
-        self.assertTrue(profiles["john"].startswith("# John Smith #john"))
-        self.assertTrue(profiles["mary"].startswith("# Mary Johnson #mary"))
+        self.assertRegex(profiles["john"], r"^# John Smith #john")
+        self.assertRegex(profiles["mary"], r"^# Mary Johnson #mary")
         
         # Test with one existing and one missing tag
         tags = {"john", "nonexistent"}
@@ -285,8 +296,8 @@ Content
         self.assertEqual(2, len(profiles))
         self.assertIn("home", profiles)
         self.assertIn("hotel", profiles)
-        self.assertTrue(profiles["home"].startswith("# John's Home #home"))
-        self.assertTrue(profiles["hotel"].startswith("# Grand Hotel #hotel"))
+        self.assertRegex(profiles["home"], r"^# John's Home #home")
+        self.assertRegex(profiles["hotel"], r"^# Grand Hotel #hotel")
         
         # Test with one existing and one missing tag
         tags = {"hotel", "nonexistent"}
@@ -303,7 +314,7 @@ Content
         profiles = outline_util.get_setting_profiles(self.sample_settings, tags)
         self.assertEqual(1, len(profiles))
         self.assertIn("train-station", profiles)
-        self.assertTrue(profiles["train-station"].startswith("# Central Train Station #train-station"))
+        self.assertRegex(profiles["train-station"], r"^# Central Train Station #train-station")
         
         # Test with empty tags
         tags = set()
@@ -326,7 +337,7 @@ Content
         self.assertIn('all_content', result)
         
         self.assertEqual("## Chapter 1: The Beginning #john #mary #home", result['chapter_heading'])
-        self.assertTrue(result['chapter_content'].startswith("SETTING: John's home"))
+        self.assertRegex(result['chapter_content'], r"^SETTING: John's home")
         self.assertTrue("# John Smith #john" in result['characters'])
         self.assertTrue("# Mary Johnson #mary" in result['characters'])
         self.assertTrue("# John's Home #home" in result['settings'])
@@ -348,6 +359,41 @@ Content
         
         self.assertTrue(any("Chapter 10" in msg for msg in log.output))
 
+    def test_get_all_chapters_content(self):
+        """Test that get_all_chapters_content matches per-chapter get_chapter_content."""
+        with self.assertLogs(level='WARNING'):
+            all_content = outline_util.get_all_chapters_content(
+                self.sample_outline, self.sample_characters, self.sample_settings
+            )
+        
+        self.assertEqual([1, 2, 3, 5], list(all_content))
+        for chapter_num, content in all_content.items():
+            with self.assertLogs(level='WARNING'):
+                expected = outline_util.get_chapter_content(
+                    self.sample_outline, chapter_num, self.sample_characters, self.sample_settings
+                )
+            self.assertEqual(expected, content)
+        
+        # Test with an outline without chapters
+        self.assertEqual({}, outline_util.get_all_chapters_content("", "", ""))
+
+    def test_large_outline(self):
+        """Test the outline functions on a book-sized outline."""
+        # Repeat the sample sections, so chapter numbers restart in each copy
+        outline = "\n".join([self.sample_outline] * 200)
+        
+        with self.assertLogs(level='INFO'):
+            renumbered = outline_util.renumber_chapters(outline)
+        with self.assertLogs(level='INFO'):
+            self.assertEqual(1000, outline_util.count_chapters(renumbered))
+        
+        index = outline_util.OutlineIndex(renumbered)
+        self.assertEqual(list(range(1, 1001)), index.chapter_numbers())
+        heading, content, preceding = index.chapter_content(1000)
+        self.assertEqual("## Chapter 1000: The Chase #john #mary #bob #city-streets", heading)
+        self.assertRegex(content, r"^SETTING: Downtown city streets")
+        self.assertRegex(preceding, r"^## Chapter 999: The Mistake")
+
     @patch('outline_util.find_chapter_content')
     def test_get_chapter_content_exception_handling(self, mock_find):
         """Test exception handling in get_chapter_content."""
@@ -1,9 +1,11 @@
 import os
 import re
 import json
+import hashlib
 import logging
 import datetime
 import markdown
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from typing import Dict, List, Any, Optional, Set, Tuple, Union
 
@@ -23,6 +25,262 @@ DEFAULT_REVISIONS_DIR = os.path.join(DEFAULT_PREVIEW_DIR, "revisions")
 DEFAULT_TAGS_DIR = os.path.join(DEFAULT_PREVIEW_DIR, "tags")
 DEFAULT_ACTIONS_DIR = os.path.join(DEFAULT_PREVIEW_DIR, "actions")
 
+# Stylesheet shared by all preview pages
+_CSS_CONTENT = """\
+:root {
+    --primary-color: #2c3e50;
+    --secondary-color: #3498db;
+    --background-color: #f9f9f9;
+    --text-color: #333;
+    --link-color: #3498db;
+    --border-color: #ddd;
+    --success-color: #2ecc71;
+    --warning-color: #f39c12;
+    --danger-color: #e74c3c;
+    --info-color: #3498db;
+}
+
+body {
+    font-family: -apple-system, BlinkMacSystemFont, "Segoe UI", Roboto, Helvetica, Arial, sans-serif;
+    line-height: 1.6;
+    color: var(--text-color);
+    background-color: var(--background-color);
+    margin: 0;
+    padding: 20px;
+}
+
+.container {
+    max-width: 1200px;
+    margin: 0 auto;
+    padding: 0 15px;
+}
+
+header {
+    background-color: var(--primary-color);
+    color: white;
+    padding: 1rem;
+    margin-bottom: 2rem;
+    border-radius: 5px;
+}
+
+header h1 {
+    margin: 0;
+}
+
+h1, h2, h3, h4, h5, h6 {
+    color: var(--primary-color);
+    margin-top: 1.5rem;
+    margin-bottom: 1rem;
+}
+
+a {
+    color: var(--link-color);
+    text-decoration: none;
+}
+
+a:hover {
+    text-decoration: underline;
+}
+
+.card {
+    background-color: white;
+    border-radius: 5px;
+    box-shadow: 0 2px 4px rgba(0, 0, 0, 0.1);
+    padding: 1.5rem;
+    margin-bottom: 1.5rem;
+}
+
+.card-header {
+    border-bottom: 1px solid var(--border-color);
+    padding-bottom: 0.5rem;
+    margin-bottom: 1rem;
+}
+
+.card-title {
+    margin: 0;
+    color: var(--primary-color);
+}
+
+.status-box {
+    padding: 1rem;
+    border-radius: 5px;
+    margin-bottom: 1.5rem;
+}
+
+.status-running {
+    background-color: var(--info-color);
+    color: white;
+}
+
+.status-success {
+    background-color: var(--success-color);
+    color: white;
+}
+
+.status-failure {
+    background-color: var(--danger-color);
+    color: white;
+}
+
+table {
+    width: 100%;
+    border-collapse: collapse;
+    margin-bottom: 1.5rem;
+}
+
+th, td {
+    padding: 0.75rem;
+    text-align: left;
+    border-bottom: 1px solid var(--border-color);
+}
+
+th {
+    background-color: var(--primary-color);
+    color: white;
+}
+
+tr:nth-child(even) {
+    background-color: rgba(0, 0, 0, 0.05);
+}
+
+.nav {
+    display: flex;
+    list-style: none;
+    padding: 0;
+    margin: 0 0 1.5rem 0;
+    background-color: var(--primary-color);
+    border-radius: 5px;
+}
+
+.nav li {
+    padding: 0;
+}
+
+.nav a {
+    display: block;
+    padding: 0.75rem 1rem;
+    color: white;
+    text-decoration: none;
+}
+
+.nav a:hover {
+    background-color: rgba(255, 255, 255, 0.1);
+}
+
+.tag {
+    display: inline-block;
+    background-color: var(--secondary-color);
+    color: white;
+    padding: 0.25rem 0.5rem;
+    border-radius: 3px;
+    margin-right: 0.5rem;
+    margin-bottom: 0.5rem;
+    font-size: 0.875rem;
+}
+
+.tag a {
+    color: white;
+}
+
+.document-content {
+    background-color: white;
+    padding: 1.5rem;
+    border-radius: 5px;
+    box-shadow: 0 2px 4px rgba(0, 0, 0, 0.1);
+}
+
+.properties-table {
+    width: 100%;
+    margin-bottom: 1.5rem;
+}
+
+.chapter-list, .document-list {
+    list-style: none;
+    padding: 0;
+}
+
+.chapter-list li, .document-list li {
+    margin-bottom: 0.5rem;
+    padding: 0.75rem;
+    background-color: white;
+    border-radius: 5px;
+    box-shadow: 0 1px 3px rgba(0, 0, 0, 0.1);
+}
+
+.chapter-list li:hover, .document-list li:hover {
+    box-shadow: 0 2px 5px rgba(0, 0, 0, 0.15);
+}
+
+.actions-list {
+    list-style: none;
+    padding: 0;
+}
+
+.actions-list li {
+    margin-bottom: 0.5rem;
+    padding: 0.75rem;
+    background-color: white;
+    border-radius: 5px;
+    box-shadow: 0 1px 3px rgba(0, 0, 0, 0.1);
+    display: flex;
+    justify-content: space-between;
+}
+
+.actions-list .action-status {
+    font-weight: bold;
+    padding: 0.25rem 0.5rem;
+    border-radius: 3px;
+}
+
+.actions-list .status-success {
+    background-color: var(--success-color);
+}
+
+.actions-list .status-failure {
+    background-color: var(--danger-color);
+}
+
+.actions-list .status-running {
+    background-color: var(--info-color);
+}
+
+footer {
+    margin-top: 3rem;
+    padding-top: 1rem;
+    border-top: 1px solid var(--border-color);
+    text-align: center;
+    font-size: 0.875rem;
+    color: #777;
+}
+"""
+
+# Markdown is rendered in worker processes once a run has enough distinct texts
+# for the parallel conversion to outweigh the cost of starting the processes
+_PARALLEL_RENDER_MIN_TEXTS = 16
+
+# Rendered HTML that document and tag links must not be inserted into: whole
+# pre, code and link elements, the markup of any other tag, and character references
+_HTML_SKIP = r'(?P<skip><(?P<element>pre|code|a)\b[^>]*>(?s:.*?)</(?P=element)\s*>|<[^>]*>|&#?\w+;)'
+
+# Tags (#tag) in the text of rendered HTML, except a '#' at the start of a line
+_HTML_TAG_RE = re.compile(_HTML_SKIP + r'|(?<!^)#(?P<tag>\w+)', re.MULTILINE)
+
+# Tags (#tag) in document text, except a '#' right after a newline
+_TEXT_TAG_RE = re.compile(r'(?<!\n)#(\w+)')
+
+
+def _render_markdown(markdown_text):
+    """
+    Convert Markdown text to HTML in a worker process.
+    
+    Args:
+        markdown_text: Markdown text to convert
+        
+    Returns:
+        HTML content
+    """
+    return markdown.markdown(markdown_text, extensions=['tables'])
+
 
 class HTMLPreviewGenerator:
     """
@@ -60,258 +318,50 @@ class HTMLPreviewGenerator:
         # Markdown converter
         self.md = markdown.Markdown(extensions=['tables'])
         
+        # Rendered HTML keyed by a digest of the Markdown source, so identical
+        # texts (e.g. unchanged versions of a document) are converted once per run
+        self._html_cache: Dict[bytes, str] = {}
+        
         # Cache for document information
         self.doc_cache = {}
         self.all_tags = set()
         
+        # Footer timestamp shared by all pages of a generate_preview() run
+        self._run_timestamp = None
+        
+        # Navigation HTML by active navigation item
+        self._nav_html_cache: Dict[Optional[str], str] = {}
+        
+        # Compiled document name patterns, valid for the names in _doc_pattern_names
+        self._doc_pattern_names: Tuple[str, ...] = ()
+        self._doc_name_patterns: Dict[Tuple[str, bool, bool], re.Pattern] = {}
+        
         # Create CSS file
         self._create_css_file()
     
     def _create_css_file(self):
-        """Create a CSS file for styling the HTML pages."""
-        css_content = """
-        :root {
-            --primary-color: #2c3e50;
-            --secondary-color: #3498db;
-            --background-color: #f9f9f9;
-            --text-color: #333;
-            --link-color: #3498db;
-            --border-color: #ddd;
-            --success-color: #2ecc71;
-            --warning-color: #f39c12;
-            --danger-color: #e74c3c;
-            --info-color: #3498db;
-        }
-        
-        body {
-            font-family: -apple-system, BlinkMacSystemFont, "Segoe UI", Roboto, Helvetica, Arial, sans-serif;
-            line-height: 1.6;
-            color: var(--text-color);
-            background-color: var(--background-color);
-            margin: 0;
-            padding: 20px;
-        }
-        
-        .container {
-            max-width: 1200px;
-            margin: 0 auto;
-            padding: 0 15px;
-        }
-        
-        header {
-            background-color: var(--primary-color);
-            color: white;
-            padding: 1rem;
-            margin-bottom: 2rem;
-            border-radius: 5px;
-        }
-        
-        header h1 {
-            margin: 0;
-        }
-        
-        h1, h2, h3, h4, h5, h6 {
-            color: var(--primary-color);
-            margin-top: 1.5rem;
-            margin-bottom: 1rem;
-        }
-        
-        a {
-            color: var(--link-color);
-            text-decoration: none;
-        }
-        
-        a:hover {
-            text-decoration: underline;
-        }
-        
-        .card {
-            background-color: white;
-            border-radius: 5px;
-            box-shadow: 0 2px 4px rgba(0, 0, 0, 0.1);
-            padding: 1.5rem;
-            margin-bottom: 1.5rem;
-        }
-        
-        .card-header {
-            border-bottom: 1px solid var(--border-color);
-            padding-bottom: 0.5rem;
-            margin-bottom: 1rem;
-        }
-        
-        .card-title {
-            margin: 0;
-            color: var(--primary-color);
-        }
-        
-        .status-box {
-            padding: 1rem;
-            border-radius: 5px;
-            margin-bottom: 1.5rem;
-        }
-        
-        .status-running {
-            background-color: var(--info-color);
-            color: white;
-        }
-        
-        .status-success {
-            background-color: var(--success-color);
-            color: white;
-        }
-        
-        .status-failure {
-            background-color: var(--danger-color);
-            color: white;
-        }
-        
-        table {
-            width: 100%;
-            border-collapse: collapse;
-            margin-bottom: 1.5rem;
-        }
-        
-        th, td {
-            padding: 0.75rem;
-            text-align: left;
-            border-bottom: 1px solid var(--border-color);
-        }
-        
-        th {
-            background-color: var(--primary-color);
-            color: white;
-        }
-        
-        tr:nth-child(even) {
-            background-color: rgba(0, 0, 0, 0.05);
-        }
-        
-        .nav {
-            display: flex;
-            list-style: none;
-            padding: 0;
-            margin: 0 0 1.5rem 0;
-            background-color: var(--primary-color);
-            border-radius: 5px;
-        }
-        
-        .nav li {
-            padding: 0;
-        }
-        
-        .nav a {
-            display: block;
-            padding: 0.75rem 1rem;
-            color: white;
-            text-decoration: none;
-        }
-        
-        .nav a:hover {
-            background-color: rgba(255, 255, 255, 0.1);
-        }
-        
-        .tag {
-            display: inline-block;
-            background-color: var(--secondary-color);
-            color: white;
-            padding: 0.25rem 0.5rem;
-            border-radius: 3px;
-            margin-right: 0.5rem;
-            margin-bottom: 0.5rem;
-            font-size: 0.875rem;
-        }
-        
-        .tag a {
-            color: white;
-        }
-        
-        .document-content {
-            background-color: white;
-            padding: 1.5rem;
-            border-radius: 5px;
-            box-shadow: 0 2px 4px rgba(0, 0, 0, 0.1);
-        }
-        
-        .properties-table {
-            width: 100%;
-            margin-bottom: 1.5rem;
-        }
-        
-        .chapter-list, .document-list {
-            list-style: none;
-            padding: 0;
-        }
-        
-        .chapter-list li, .document-list li {
-            margin-bottom: 0.5rem;
-            padding: 0.75rem;
-            background-color: white;
-            border-radius: 5px;
-            box-shadow: 0 1px 3px rgba(0, 0, 0, 0.1);
-        }
-        
-        .chapter-list li:hover, .document-list li:hover {
-            box-shadow: 0 2px 5px rgba(0, 0, 0, 0.15);
-        }
-        
-        .actions-list {
-            list-style: none;
-            padding: 0;
-        }
-        
-        .actions-list li {
-            margin-bottom: 0.5rem;
-            padding: 0.75rem;
-            background-color: white;
-            border-radius: 5px;
-            box-shadow: 0 1px 3px rgba(0, 0, 0, 0.1);
-            display: flex;
-            justify-content: space-between;
-        }
-        
-        .actions-list .action-status {
-            font-weight: bold;
-            padding: 0.25rem 0.5rem;
-            border-radius: 3px;
-        }
-        
-        .actions-list .status-success {
-            background-color: var(--success-color);
-        }
-        
-        .actions-list .status-failure {
-            background-color: var(--danger-color);
-        }
-        
-        .actions-list .status-running {
-            background-color: var(--info-color);
-        }
-        
-        footer {
-            margin-top: 3rem;
-            padding-top: 1rem;
-            border-top: 1px solid var(--border-color);
-            text-align: center;
-            font-size: 0.875rem;
-            color: #777;
-        }
-        """
-        
+        """Create a CSS file for styling the HTML pages, unless it is already up to date."""
         css_path = os.path.join(self.static_dir, "style.css")
+        try:
+            with open(css_path, "r") as css_file:
+                if css_file.read() == _CSS_CONTENT:
+                    return
+        except (FileNotFoundError, UnicodeDecodeError):
+            pass
+        
         with open(css_path, "w") as css_file:
-            css_file.write(css_content)
+            css_file.write(_CSS_CONTENT)
     
-    def _create_html_template(self, title, body, active_nav=None):
+    def _html_page_frame(self, title, active_nav=None):
         """
-        Create an HTML template with navigation and common elements.
+        Create the HTML that surrounds a page's content: head, navigation and footer.
         
         Args:
             title: Page title
-            body: Page content
             active_nav: Active navigation item
             
         Returns:
-            Complete HTML page
+            Tuple of (HTML before the content, HTML after the content)
         """
         # Determine the proper path prefix based on the depth of the file
         # For index.html at the root, we need no prefix
@@ -320,21 +370,25 @@ class HTMLPreviewGenerator:
         if active_nav and active_nav != "home":
             path_prefix = "../"
         
-        nav_items = [
-            {"id": "home", "name": "Home", "url": f"{path_prefix}index.html"},
-            {"id": "docs", "name": "Documents", "url": f"{path_prefix}index.html"},
-            {"id": "tags", "name": "Tags", "url": f"{path_prefix}tags/index.html"},
-            {"id": "actions", "name": "Actions", "url": f"{path_prefix}actions/index.html"},
-            {"id": "bots", "name": "Bots", "url": f"{path_prefix}bots/index.html"}
-        ]
-        
-        nav_html = '<ul class="nav">'
-        for item in nav_items:
-            active_class = ' class="active"' if item["id"] == active_nav else ''
-            nav_html += f'<li{active_class}><a href="{item["url"]}">{item["name"]}</a></li>'
-        nav_html += '</ul>'
-        
-        html = f"""<!DOCTYPE html>
+        # The navigation only depends on the active item, so build it once per item
+        nav_html = self._nav_html_cache.get(active_nav)
+        if nav_html is None:
+            nav_items = [
+                {"id": "home", "name": "Home", "url": f"{path_prefix}index.html"},
+                {"id": "docs", "name": "Documents", "url": f"{path_prefix}index.html"},
+                {"id": "tags", "name": "Tags", "url": f"{path_prefix}tags/index.html"},
+                {"id": "actions", "name": "Actions", "url": f"{path_prefix}actions/index.html"},
+                {"id": "bots", "name": "Bots", "url": f"{path_prefix}bots/index.html"}
+            ]
+            
+            nav_html = '<ul class="nav">'
+            for item in nav_items:
+                active_class = ' class="active"' if item["id"] == active_nav else ''
+                nav_html += f'<li{active_class}><a href="{item["url"]}">{item["name"]}</a></li>'
+            nav_html += '</ul>'
+            self._nav_html_cache[active_nav] = nav_html
+        
+        head = f"""<!DOCTYPE html>
     <html lang="en">
     <head>
         <meta charset="UTF-8">
@@ -350,35 +404,80 @@ class HTMLPreviewGenerator:
             {nav_html}
             <main>
                 <h1>{title}</h1>
-                {body}
+                """
+        tail = f"""
             </main>
             <footer>
-                <p>Generated on {datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')}</p>
+                <p>Generated on {self._run_timestamp or self._timestamp()}</p>
             </footer>
         </div>
     </body>
     </html>
     """
-        return html
+        return head, tail
     
-    def generate_preview(self):
-        """Generate the complete HTML preview."""
-        logger.info("Generating HTML preview...")
-        
-        # Generate index page
-        self._generate_index()
+    @staticmethod
+    def _timestamp():
+        """Get the current time as shown in page footers."""
+        return datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    
+    def _create_html_template(self, title, body, active_nav=None):
+        """
+        Create an HTML template with navigation and common elements.
         
-        # Generate document pages
-        self._generate_document_pages()
+        Args:
+            title: Page title
+            body: Page content
+            active_nav: Active navigation item
+            
+        Returns:
+            Complete HTML page
+        """
+        head, tail = self._html_page_frame(title, active_nav)
+        return head + body + tail
+    
+    def _write_html_page(self, path, title, body, active_nav=None):
+        """
+        Write an HTML page with navigation and common elements to a file.
         
-        # Generate tag pages
-        self._generate_tag_pages()
+        The page is written in pieces rather than first being assembled into one
+        string, so the page body is not copied again.
         
-        # Generate action pages
-        self._generate_action_pages()
+        Args:
+            path: Path of the HTML file
+            title: Page title
+            body: Page content
+            active_nav: Active navigation item
+        """
+        head, tail = self._html_page_frame(title, active_nav)
+        with open(path, "w") as html_file:
+            html_file.write(head)
+            html_file.write(body)
+            html_file.write(tail)
+    
+    def generate_preview(self):
+        """Generate the complete HTML preview."""
+        logger.info("Generating HTML preview...")
         
-        # Generate bot pages
-        self._generate_bot_pages()
+        # Stamp every page of this run with the same time
+        self._run_timestamp = self._timestamp()
+        try:
+            # Generate index page
+            self._generate_index()
+            
+            # Generate document pages
+            self._generate_document_pages()
+            
+            # Generate tag pages
+            self._generate_tag_pages()
+            
+            # Generate action pages
+            self._generate_action_pages()
+            
+            # Generate bot pages
+            self._generate_bot_pages()
+        finally:
+            self._run_timestamp = None
         
         logger.info(f"HTML preview generated in {self.preview_dir}")
     
@@ -436,13 +535,9 @@ class HTMLPreviewGenerator:
         </div>
         """
         
-        # Create the HTML page
-        html = self._create_html_template("Home", body, active_nav="home")
-        
-        # Write to file
+        # Write the HTML page to file
         index_path = os.path.join(self.preview_dir, "index.html")
-        with open(index_path, "w") as index_file:
-            index_file.write(html)
+        self._write_html_page(index_path, "Home", body, active_nav="home")
     
     def _get_action_status_html(self):
         """Get HTML for the current action status."""
@@ -516,6 +611,9 @@ class HTMLPreviewGenerator:
         """Generate HTML pages for all documents."""
         logger.info("Generating document pages...")
         
+        # Convert the documents' Markdown up front, in parallel for larger repos
+        self._prerender_markdown(doc_info["text"] for doc_info in self.doc_cache.values())
+        
         # Process each document
         for doc_name, doc_info in self.doc_cache.items():
             properties = doc_info["properties"]
@@ -526,8 +624,7 @@ class HTMLPreviewGenerator:
             html_content = self._convert_markdown_to_html(text)
             
             # Process document links and tags
-            html_content = self._process_document_links(html_content)
-            html_content = self._process_tags(html_content)
+            html_content = self._process_links_and_tags(html_content)
             
             # Generate properties table
             properties_html = self._generate_properties_table(properties, doc_name)
@@ -550,20 +647,66 @@ class HTMLPreviewGenerator:
             </div>
             """
             
-            # Create the HTML page
-            html = self._create_html_template(doc_name, body, active_nav="docs")
-            
-            # Write to file
+            # Write the HTML page to file
             doc_path = os.path.join(self.docs_dir, f"{doc_name}.html")
-            with open(doc_path, "w") as doc_file:
-                doc_file.write(html)
+            self._write_html_page(doc_path, doc_name, body, active_nav="docs")
             
             # Generate revision pages
             self._generate_revision_page(doc_name, versions)
             
-            # Generate version pages
+            # Generate version pages, loading every version of the document in one batch
+            doc = self.doc_repo.get_doc(doc_name)
+            if not doc:
+                continue
+            try:
+                bundle = doc.get_version_bundle(versions)
+            except Exception as e:
+                # Load the versions one at a time instead, so one unreadable version doesn't hide the others
+                logger.warning(f"Error loading versions of {doc_name} in one batch: {e}")
+                bundle = {}
             for version in versions:
-                self._generate_version_page(doc_name, version)
+                self._generate_version_page(doc, doc_name, version, bundle.get(version))
+    
+    @staticmethod
+    def _markdown_cache_key(markdown_text):
+        """
+        Get the key of a Markdown text in the rendered HTML cache.
+        
+        Args:
+            markdown_text: Markdown text
+            
+        Returns:
+            Digest of the text
+        """
+        return hashlib.blake2b(markdown_text.encode('utf-8', 'surrogatepass'), digest_size=16).digest()
+    
+    def _prerender_markdown(self, texts):
+        """
+        Convert Markdown texts to HTML in worker processes and cache the results.
+        
+        Markdown conversion is pure Python and CPU-bound, so threads would not run
+        it in parallel. Small batches are left to _convert_markdown_to_html, as are
+        any texts whose conversion fails here.
+        
+        Args:
+            texts: Markdown texts to convert
+        """
+        pending = {}
+        for text in texts:
+            cache_key = self._markdown_cache_key(text)
+            if cache_key not in self._html_cache:
+                pending.setdefault(cache_key, text)
+        
+        if len(pending) < _PARALLEL_RENDER_MIN_TEXTS:
+            return
+        
+        try:
+            with ProcessPoolExecutor() as executor:
+                rendered = executor.map(_render_markdown, pending.values(), chunksize=4)
+                for cache_key, html in zip(pending, rendered):
+                    self._html_cache[cache_key] = html
+        except Exception as e:
+            logger.warning(f"Parallel Markdown conversion failed, converting serially: {e}")
     
     def _convert_markdown_to_html(self, markdown_text):
         """
@@ -575,6 +718,11 @@ class HTMLPreviewGenerator:
         Returns:
             HTML content
         """
+        cache_key = self._markdown_cache_key(markdown_text)
+        html = self._html_cache.get(cache_key)
+        if html is not None:
+            return html
+        
         try:
             # Convert Markdown to HTML
             html = self.md.convert(markdown_text)
@@ -582,6 +730,7 @@ class HTMLPreviewGenerator:
             # Reset the converter for the next document
             self.md.reset()
             
+            self._html_cache[cache_key] = html
             return html
         except Exception as e:
             logger.error(f"Error converting Markdown to HTML: {e}")
@@ -624,23 +773,87 @@ class HTMLPreviewGenerator:
         Returns:
             Processed HTML content
         """
-        # This is a simplified approach; in a real implementation, you'd want
-        # to use a proper HTML parser to avoid breaking HTML tags
-        doc_names = list(self.doc_cache.keys())
-        
-        # Sort by length (longest first) to avoid partial matches
-        doc_names.sort(key=len, reverse=True)
-        
-        for doc_name in doc_names:
-            # Look for the document name in a word boundary
-            pattern = r'\b(' + re.escape(doc_name) + r')(?!\w)'
-            html_content = re.sub(
-                pattern,
-                r'<a href="docs/\1.html">\1</a>',  # Remove the ../ prefix
-                html_content
-            )
-        
-        return html_content
+        pattern = self._doc_names_pattern(r'(?!\w)', html=True)
+        if pattern is None:
+            return html_content
+        
+        # Link every document name in a single pass, skipping markup, code and existing links
+        def link_doc(match):
+            if match.group('skip') is not None:
+                return match.group(0)
+            name = match.group('name')
+            return f'<a href="docs/{name}.html">{name}</a>'  # Remove the ../ prefix
+        
+        return pattern.sub(link_doc, html_content)
+    
+    def _process_links_and_tags(self, html_content):
+        """
+        Process document links and tags in HTML content in a single pass.
+        
+        Gives the same result as _process_document_links followed by _process_tags:
+        a '#' directly followed by a document name links the document, not a tag.
+        
+        Args:
+            html_content: HTML content to process
+            
+        Returns:
+            Processed HTML content with document and tag links
+        """
+        pattern = self._doc_names_pattern(r'(?!\w)', html=True, tags=True)
+        if pattern is None:
+            return self._process_tags(html_content)
+        
+        def link(match):
+            if match.group('skip') is not None:
+                return match.group(0)
+            name = match.group('name')
+            if name is not None:
+                return f'<a href="docs/{name}.html">{name}</a>'  # Remove the ../ prefix
+            tag = match.group('tag')
+            self.all_tags.add(tag)
+            return f'<a href="tags/{tag}.html" class="tag">#{tag}</a>'  # Remove the ../ prefix
+        
+        return pattern.sub(link, html_content)
+    
+    def _doc_names_pattern(self, suffix, html=False, tags=False):
+        """
+        Get a pattern matching any cached document name as a whole word.
+        
+        Names are tried longest first to avoid partial matches. The pattern is
+        compiled once and reused until the set of cached documents changes.
+        
+        Args:
+            suffix: Lookahead that must follow a name
+            html: Whether the pattern is for rendered HTML, in which case it also
+                matches the markup to skip (see _HTML_SKIP) in a 'skip' group
+            tags: Whether the pattern also matches tags that are not document
+                names, capturing them in a 'tag' group
+            
+        Returns:
+            Compiled pattern capturing the name in a 'name' group, or None if there
+            are no documents
+        """
+        names = tuple(self.doc_cache)
+        if names != self._doc_pattern_names:
+            self._doc_pattern_names = names
+            self._doc_name_patterns = {}
+        
+        if not names:
+            return None
+        
+        pattern = self._doc_name_patterns.get((suffix, html, tags))
+        if pattern is None:
+            alternatives = '|'.join(re.escape(name) for name in sorted(names, key=len, reverse=True))
+            pattern = r'\b(?P<name>' + alternatives + r')' + suffix
+            if html:
+                pattern = _HTML_SKIP + '|' + pattern
+            if tags:
+                # Same as _HTML_TAG_RE, except for a '#' directly before a document name
+                pattern += r'|(?<!^)#(?!(?:' + alternatives + r')' + suffix + r')(?P<tag>\w+)'
+            pattern = re.compile(pattern, re.MULTILINE)
+            self._doc_name_patterns[(suffix, html, tags)] = pattern
+        return pattern
+    
     # Fix for _process_tags
     def _process_tags(self, html_content):
         """
@@ -652,20 +865,16 @@ class HTMLPreviewGenerator:
         Returns:
             Processed HTML content with tag links
         """
-        # Find all tags (# followed by alphanumeric characters) but not at the beginning of a line
-        tags = re.findall(r'(?<!^)#(\w+)', html_content, re.MULTILINE)
-        self.all_tags.update(tags)
-        
-        # Replace tags with links (not at beginning of line)
-        for tag in tags:
-            pattern = r'(?<!\n)#(' + re.escape(tag) + r')\b'
-            html_content = re.sub(
-                pattern,
-                r'<a href="tags/\1.html" class="tag">#\1</a>',  # Remove the ../ prefix
-                html_content
-            )
-        
-        return html_content
+        # Find tags (# followed by alphanumeric characters) but not at the beginning of a line,
+        # and replace each with a link as it is found, skipping markup, code and existing links
+        def link_tag(match):
+            if match.group('skip') is not None:
+                return match.group(0)
+            tag = match.group('tag')
+            self.all_tags.add(tag)
+            return f'<a href="tags/{tag}.html" class="tag">#{tag}</a>'  # Remove the ../ prefix
+        
+        return _HTML_TAG_RE.sub(link_tag, html_content)
     
     def _convert_doc_refs_to_links(self, text):
         """
@@ -689,30 +898,23 @@ class HTMLPreviewGenerator:
         
         text = re.sub(doc_version_pattern, replace_doc_version, text)
         
-        # Get list of all bot names (documents with type "prompt")
-        bot_names = []
+        # Get the set of all bot names (documents with type "prompt")
+        bot_names = set()
         for doc_name, doc_info in self.doc_cache.items():
             properties = doc_info.get("properties", {})
             if properties.get("type") == "prompt":
-                bot_names.append(doc_name)
+                bot_names.add(doc_name)
         
-        # Sort by length (longest first) to avoid partial matches
-        bot_names.sort(key=len, reverse=True)
+        def replace_name(match):
+            name = match.group('name')
+            if name in bot_names:
+                return f'<a href="../bots/{name}.html">{name}</a>'
+            return f'<a href="../docs/{name}.html">{name}</a>'
         
-        # Check for bot names
-        for bot_name in bot_names:
-            pattern = r'\b(' + re.escape(bot_name) + r')(?!\w|#)'
-            text = re.sub(pattern, r'<a href="../bots/\1.html">\1</a>', text)
-        
-        # Check for plain document names (do this last to avoid overriding more specific patterns)
-        doc_names = list(self.doc_cache.keys())
-        for doc_name in doc_names:
-            # Skip bot names as we've already processed them
-            if doc_name in bot_names:
-                continue
-                
-            pattern = r'\b(' + re.escape(doc_name) + r')(?!\w|#)'
-            text = re.sub(pattern, r'<a href="../docs/\1.html">\1</a>', text)
+        # Link bot and document names in a single pass
+        pattern = self._doc_names_pattern(r'(?!\w|#)')
+        if pattern is not None:
+            text = pattern.sub(replace_name, text)
         
         return text
     def _generate_revision_page(self, doc_name, versions):
@@ -744,35 +946,31 @@ class HTMLPreviewGenerator:
         </div>
         """
         
-        html = self._create_html_template(f"Revision History - {doc_name}", body, active_nav="docs")
-        
-        # Write to file
+        # Write the HTML page to file
         revision_path = os.path.join(self.revisions_dir, f"{doc_name}.html")
-        with open(revision_path, "w") as revision_file:
-            revision_file.write(html)
+        self._write_html_page(revision_path, f"Revision History - {doc_name}", body, active_nav="docs")
     
-    def _generate_version_page(self, doc_name, version):
+    def _generate_version_page(self, doc, doc_name, version, loaded=None):
         """
         Generate page for a specific document version.
         
         Args:
+            doc: Document object
             doc_name: Document name
             version: Version number
+            loaded: Properties and text of the version if already loaded, otherwise
+                they are read from the document
         """
-        doc = self.doc_repo.get_doc(doc_name)
-        if not doc:
-            return
-        
         try:
-            properties = doc.get_version_properties(version)
-            text = doc.get_version_text(version)
+            if loaded is None:
+                loaded = (doc.get_version_properties(version), doc.get_version_text(version))
+            properties, text = loaded
             
             # Convert text to HTML
             html_content = self._convert_markdown_to_html(text)
             
             # Process document links and tags
-            html_content = self._process_document_links(html_content)
-            html_content = self._process_tags(html_content)
+            html_content = self._process_links_and_tags(html_content)
             
             # Generate properties table
             properties_html = self._generate_properties_table(properties, doc_name)
@@ -792,13 +990,9 @@ class HTMLPreviewGenerator:
             </div>
             """
             
-            # Create the HTML page
-            html = self._create_html_template(f"{doc_name} - Version {version}", body, active_nav="docs")
-            
-            # Write to file
+            # Write the HTML page to file
             version_path = os.path.join(self.revisions_dir, f"{doc_name}_v{version}.html")
-            with open(version_path, "w") as version_file:
-                version_file.write(html)
+            self._write_html_page(version_path, f"{doc_name} - Version {version}", body, active_nav="docs")
                 
         except Exception as e:
             logger.error(f"Error generating version page for {doc_name} v{version}: {e}")
@@ -828,33 +1022,28 @@ class HTMLPreviewGenerator:
         </div>
         """
         
-        html = self._create_html_template("Tags", body, active_nav="tags")
-        
-        # Write to file
+        # Write the HTML page to file
         tag_index_path = os.path.join(self.tags_dir, "index.html")
-        with open(tag_index_path, "w") as tag_index_file:
-            tag_index_file.write(html)
+        self._write_html_page(tag_index_path, "Tags", body, active_nav="tags")
+        
+        # Find the tags in each document once (not at beginning of line)
+        docs_by_tag = {}
+        for doc_name, doc_info in self.doc_cache.items():
+            for tag in set(_TEXT_TAG_RE.findall(doc_info["text"])):
+                docs_by_tag.setdefault(tag, []).append(doc_name)
         
         # Generate individual tag pages
         for tag in self.all_tags:
-            self._generate_tag_page(tag)
+            self._generate_tag_page(tag, docs_by_tag.get(tag, []))
     
-    def _generate_tag_page(self, tag):
+    def _generate_tag_page(self, tag, tag_docs):
         """
         Generate page for a specific tag.
         
         Args:
             tag: Tag name
+            tag_docs: Names of the documents with this tag
         """
-        # Find all documents with this tag
-        tag_docs = []
-        
-        for doc_name, doc_info in self.doc_cache.items():
-            text = doc_info["text"]
-            # Look for the tag (not at beginning of line)
-            if re.search(r'(?<!\n)#' + re.escape(tag) + r'\b', text, re.MULTILINE):
-                tag_docs.append(doc_name)
-        
         # Create document list
         doc_list_html = '<h2>Documents with this tag</h2>'
         
@@ -877,12 +1066,9 @@ class HTMLPreviewGenerator:
         </div>
         """
         
-        html = self._create_html_template(f"Tag - #{tag}", body, active_nav="tags")
-        
-        # Write to file
+        # Write the HTML page to file
         tag_path = os.path.join(self.tags_dir, f"{tag}.html")
-        with open(tag_path, "w") as tag_file:
-            tag_file.write(html)
+        self._write_html_page(tag_path, f"Tag - #{tag}", body, active_nav="tags")
         
     def _generate_action_pages(self):
             """Generate action index and individual action pages."""
@@ -938,12 +1124,9 @@ class HTMLPreviewGenerator:
             </div>
             """
             
-            html = self._create_html_template("Actions", body, active_nav="actions")
-            
-            # Write to file
+            # Write the HTML page to file
             action_index_path = os.path.join(self.actions_dir, "index.html")
-            with open(action_index_path, "w") as action_index_file:
-                action_index_file.write(html)
+            self._write_html_page(action_index_path, "Actions", body, active_nav="actions")
         
     def _generate_action_page(self, action, index):
         """
@@ -1023,12 +1206,9 @@ class HTMLPreviewGenerator:
         </div>
         """
         
-        html = self._create_html_template(f"Action - {command}", body, active_nav="actions")
-        
-        # Write to file
+        # Write the HTML page to file
         action_path = os.path.join(self.actions_dir, f"action_{index}.html")
-        with open(action_path, "w") as action_file:
-            action_file.write(html)
+        self._write_html_page(action_path, f"Action - {command}", body, active_nav="actions")
     
     def _generate_bot_pages(self):
         """Generate bot index and individual bot pages."""
@@ -1082,12 +1262,9 @@ class HTMLPreviewGenerator:
         </div>
         """
         
-        html = self._create_html_template("Bots", body, active_nav="bots")
-        
-        # Write to file
+        # Write the HTML page to file
         bot_index_path = os.path.join(bots_dir, "index.html")
-        with open(bot_index_path, "w") as bot_index_file:
-            bot_index_file.write(html)
+        self._write_html_page(bot_index_path, "Bots", body, active_nav="bots")
     
     def _generate_bot_page(self, doc_name, prompt_doc, bots_dir):
         """
@@ -1155,12 +1332,9 @@ class HTMLPreviewGenerator:
         </div>
         """
         
-        html = self._create_html_template(f"Bot - {doc_name}", body, active_nav="bots")
-        
-        # Write to file
+        # Write the HTML page to file
         bot_path = os.path.join(bots_dir, f"{doc_name}.html")
-        with open(bot_path, "w") as bot_file:
-            bot_file.write(html)
+        self._write_html_page(bot_path, f"Bot - {doc_name}", body, active_nav="bots")
 
 
 # Utility functions for parsing markdown documents
@@ -1229,7 +1403,7 @@ def extract_tags_from_text(text):
         Set of tags
     """
     # Find all tags not at the beginning of a line
-    tags = re.findall(r'(?<!\n)#(\w+)', text, re.MULTILINE)
+    tags = _TEXT_TAG_RE.findall(text)
     return set(tags)
 
 
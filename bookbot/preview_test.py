@@ -40,6 +40,10 @@ class MockDoc:
         if version in self._versions:
             return f"{self._text} (Version {version})"
         raise ValueError(f"Version {version} not found")
+    
+    def get_version_bundle(self, versions):
+        return {version: (self.get_version_properties(version), self.get_version_text(version))
+                for version in versions}
 
 
 class MockDocRepo:
@@ -252,6 +256,22 @@ Continue writing chapter {chapter_number}.""",
         self.assertTrue(os.path.exists(os.path.join(self.preview_dir, "static")))
         self.assertTrue(os.path.exists(os.path.join(self.preview_dir, "docs")))
     
+    def test_create_css_file_only_when_stale(self):
+        """Test that the stylesheet is only rewritten when its content differs."""
+        css_path = os.path.join(self.preview_dir, "static", "style.css")
+        os.utime(css_path, ns=(1, 1))
+        
+        # Up-to-date stylesheet is left alone
+        self.generator._create_css_file()
+        self.assertEqual(os.stat(css_path).st_mtime_ns, 1)
+        
+        # Modified stylesheet is rewritten
+        with open(css_path, "w") as css_file:
+            css_file.write("body {}")
+        self.generator._create_css_file()
+        with open(css_path) as css_file:
+            self.assertIn(":root {", css_file.read())
+    
     def test_convert_markdown_to_html(self):
         """Test converting markdown to HTML."""
         markdown_text = "# Test\n\nThis is **bold** and *italic*."
@@ -261,6 +281,32 @@ Continue writing chapter {chapter_number}.""",
         self.assertIn("<strong>bold</strong>", html)
         self.assertIn("<em>italic</em>", html)
     
+    def test_convert_markdown_to_html_cached(self):
+        """Test that identical markdown is only converted once."""
+        markdown_text = "# Test\n\nThis is **bold**."
+        
+        with mock.patch.object(self.generator.md, 'convert', wraps=self.generator.md.convert) as convert:
+            first = self.generator._convert_markdown_to_html(markdown_text)
+            second = self.generator._convert_markdown_to_html(markdown_text)
+            self.generator._convert_markdown_to_html("Other text")
+        
+        self.assertEqual(first, second)
+        self.assertEqual(convert.call_count, 2)
+    
+    @mock.patch('preview._PARALLEL_RENDER_MIN_TEXTS', 1)
+    def test_prerender_markdown(self):
+        """Test that Markdown converted in worker processes matches serial conversion."""
+        texts = [doc.get_text() for doc in self.doc_repo.docs.values()]
+        expected = [self.generator._convert_markdown_to_html(text) for text in texts]
+        
+        generator = HTMLPreviewGenerator(self.doc_repo, self.preview_dir)
+        generator._prerender_markdown(texts)
+        
+        self.assertEqual(len(generator._html_cache), len(texts))
+        with mock.patch.object(generator.md, 'convert') as convert:
+            self.assertEqual(expected, [generator._convert_markdown_to_html(text) for text in texts])
+        convert.assert_not_called()
+    
     def test_process_document_links(self):
         """Test processing document links in HTML."""
         # Set up doc cache
@@ -277,6 +323,21 @@ Continue writing chapter {chapter_number}.""",
         self.assertIn('<a href="../docs/chapter2.html">chapter2</a>', processed_html)
         self.assertIn('<a href="../docs/outline.html">outline</a>', processed_html)
     
+    def test_process_document_links_single_pass(self):
+        """Test that document names are not linked inside links already inserted."""
+        self.generator.doc_cache = {
+            "chapter1": {"properties": {}, "text": "", "versions": [1]},
+            "html": {"properties": {}, "text": "", "versions": [1]}
+        }
+        
+        html = "<p>See chapter1 and html.</p>"
+        processed_html = self.generator._process_document_links(html)
+        
+        self.assertEqual(
+            '<p>See <a href="docs/chapter1.html">chapter1</a> and <a href="docs/html.html">html</a>.</p>',
+            processed_html
+        )
+    
     def test_process_tags(self):
         """Test processing tags in HTML."""
         html = "<p>This has #tag1 and #tag2.</p>"
@@ -286,6 +347,53 @@ Continue writing chapter {chapter_number}.""",
         self.assertIn('<a href="../tags/tag2.html" class="tag">#tag2</a>', processed_html)
         self.assertEqual(self.generator.all_tags, {"tag1", "tag2"})
     
+    def test_process_tags_repeated(self):
+        """Test that a repeated tag is linked once per occurrence."""
+        html = "<p>This has #tag1, #tag1 and #tag10.</p>"
+        processed_html = self.generator._process_tags(html)
+        
+        self.assertEqual(
+            '<p>This has <a href="tags/tag1.html" class="tag">#tag1</a>, '
+            '<a href="tags/tag1.html" class="tag">#tag1</a> and '
+            '<a href="tags/tag10.html" class="tag">#tag10</a>.</p>',
+            processed_html
+        )
+        self.assertEqual(self.generator.all_tags, {"tag1", "tag10"})
+    
+    def test_process_links_and_tags_skip_markup(self):
+        """Test that links and tags are not inserted into markup, code or existing links."""
+        self.generator.doc_cache = {
+            "chapter1": {"properties": {}, "text": "", "versions": [1]}
+        }
+        
+        html = ('<p><img alt="chapter1"> <code>chapter1 #tag1</code> '
+                '<a href="#tag2">chapter1</a> it&#39;s chapter1 #tag3</p>')
+        processed_html = self.generator._process_tags(self.generator._process_document_links(html))
+        
+        self.assertEqual(
+            '<p><img alt="chapter1"> <code>chapter1 #tag1</code> '
+            '<a href="#tag2">chapter1</a> it&#39;s <a href="docs/chapter1.html">chapter1</a> '
+            '<a href="tags/tag3.html" class="tag">#tag3</a></p>',
+            processed_html
+        )
+        self.assertEqual(self.generator.all_tags, {"tag3"})
+    
+    def test_process_links_and_tags(self):
+        """Test that the fused pass matches linking documents and then tags."""
+        self.generator.doc_cache = {
+            "chapter1": {"properties": {}, "text": "", "versions": [1]},
+            "outline": {"properties": {}, "text": "", "versions": [1]}
+        }
+        
+        html = "<p>See chapter1, #chapter1, #chapter1x and #tag1 in the outline.</p>"
+        expected = self.generator._process_tags(self.generator._process_document_links(html))
+        expected_tags = self.generator.all_tags
+        
+        self.generator.all_tags = set()
+        self.assertEqual(expected, self.generator._process_links_and_tags(html))
+        self.assertEqual(expected_tags, self.generator.all_tags)
+        self.assertEqual({"chapter1x", "tag1"}, self.generator.all_tags)
+    
     def test_convert_doc_refs_to_links(self):
         """Test converting document references to links."""
         # Set up doc cache
@@ -325,7 +433,52 @@ Continue writing chapter {chapter_number}.""",
         # Check that actions index was created
         actions_index_path = os.path.join(self.preview_dir, "actions", "index.html")
         self.assertTrue(os.path.exists(actions_index_path))
+    
+    @mock.patch('preview.is_action_running')
+    def test_generate_preview_single_timestamp(self, mock_is_action_running):
+        """Test that all pages of a run share one footer timestamp."""
+        mock_is_action_running.return_value = None
+        
+        with mock.patch.object(HTMLPreviewGenerator, '_timestamp', return_value="2024-01-01 00:00:00") as timestamp:
+            self.generator.generate_preview()
+        
+        timestamp.assert_called_once()
+        doc_path = os.path.join(self.preview_dir, "docs", "chapter1.html")
+        with open(doc_path) as doc_file:
+            self.assertIn("Generated on 2024-01-01 00:00:00", doc_file.read())
 
+    
+    def test_generate_version_pages_batched(self):
+        """Test that each document's versions are loaded in one batch."""
+        self.generator._get_document_lists()
+        chapter = self.doc_repo.get_doc("chapter1")
+        
+        with mock.patch.object(chapter, 'get_version_bundle', wraps=chapter.get_version_bundle) as bundle:
+            self.generator._generate_document_pages()
+        
+        bundle.assert_called_once_with([1, 2, 3])
+        for version in (1, 2, 3):
+            version_path = os.path.join(self.preview_dir, "revisions", f"chapter1_v{version}.html")
+            self.assertTrue(os.path.exists(version_path), f"Version {version} page should be written")
+    
+    def test_generate_version_pages_unreadable_version(self):
+        """Test that one unreadable version doesn't prevent the other version pages."""
+        self.generator._get_document_lists()
+        chapter = self.doc_repo.get_doc("chapter1")
+        read_text = chapter.get_version_text
+        
+        def get_version_text(version):
+            if version == 2:
+                raise RuntimeError("Version 2 is unreadable")
+            return read_text(version)
+        
+        with mock.patch.object(chapter, 'get_version_text', side_effect=get_version_text):
+            self.generator._generate_document_pages()
+        
+        for version, written in ((1, True), (2, False), (3, True)):
+            version_path = os.path.join(self.preview_dir, "revisions", f"chapter1_v{version}.html")
+            self.assertEqual(os.path.exists(version_path), written,
+                             f"Version {version} page should {'' if written else 'not '}be written")
 
 if __name__ == "__main__":
     unittest.main()